@@ -1,5 +1,7 @@
 import os
 from dataclasses import dataclass, field
+from functools import lru_cache
+from urllib.parse import urlsplit
 
 
 def _get_database_url() -> str:
@@ -22,6 +24,14 @@ def _get_session_expire_hours() -> int:
     return int(os.getenv("SESSION_EXPIRE_HOURS", "24"))
 
 
+def _get_llm_max_concurrency() -> int:
+    return int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+
+
+def _get_db_raiseload() -> bool:
+    return os.getenv("DB_RAISELOAD", "").lower() in ("1", "true", "yes")
+
+
 @dataclass
 class Settings:
     database_url: str = field(default_factory=_get_database_url)
@@ -29,6 +39,19 @@ class Settings:
     chroma_host: str = field(default_factory=_get_chroma_host)
     tabby_host: str = field(default_factory=_get_tabby_host)
     session_expire_hours: int = field(default_factory=_get_session_expire_hours)
+    llm_max_concurrency: int = field(default_factory=_get_llm_max_concurrency)
+    db_raiseload: bool = field(default_factory=_get_db_raiseload)
 
 
 settings = Settings()
+
+
+@lru_cache(maxsize=8)
+def parse_chroma_host(url: str) -> tuple[str, int]:
+    """Split a CHROMA_HOST value into (host, port), defaulting the port to 8000.
+
+    Accepts bare ``host:port`` as well as full URLs, including bracketed IPv6
+    hosts and trailing paths. Cached, since every service construction asks.
+    """
+    parts = urlsplit(url if "://" in url else f"//{url}")
+    return parts.hostname or "", parts.port or 8000
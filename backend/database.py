@@ -1,12 +1,76 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker, declarative_base, raiseload
+from sqlalchemy.pool import QueuePool
+
+from backend.config import settings
 
 Base = declarative_base()
 
 
+def utcnow() -> datetime:
+    """Timezone-aware current UTC time, for use as a column default."""
+    return datetime.now(timezone.utc)
+
+
+# Applied to every new SQLite connection. WAL lets readers proceed while a
+# write is in progress, and synchronous=NORMAL is durable under WAL without
+# an fsync on every commit. The remaining pragmas keep temp tables and hot
+# pages in memory (64 MiB page cache, 256 MiB mmap window).
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-64000",
+)
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def _is_sqlite_memory(database_url: str) -> bool:
+    return database_url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in database_url
+
+
 def get_engine(database_url: str = "sqlite:///./data/gantry.db"):
-    return create_engine(database_url, connect_args={"check_same_thread": False})
+    pool_kwargs = {}
+    if database_url.startswith("sqlite") and not _is_sqlite_memory(database_url):
+        # LIFO checkout keeps reusing the most recently returned connection,
+        # so its page cache and mmap stay warm while idle ones sit unused.
+        # In-memory databases keep SQLAlchemy's default single-connection pool.
+        pool_kwargs = {
+            "poolclass": QueuePool,
+            "pool_size": 5,
+            "max_overflow": 10,
+            "pool_use_lifo": True,
+        }
+    engine = create_engine(
+        database_url, connect_args={"check_same_thread": False}, **pool_kwargs
+    )
+    if database_url.startswith("sqlite"):
+        event.listen(engine, "connect", _apply_sqlite_pragmas)
+    return engine
 
 
 def get_session_maker(engine):
-    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    # Sessions are request-scoped and handlers return the rows they just
+    # committed, so expiring them on commit only forces a reload SELECT
+    # when the response is serialized.
+    return sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+
+def read_only_load_options() -> tuple:
+    """Loader options for read-only list queries that feed API responses.
+
+    With DB_RAISELOAD enabled (dev/CI), touching an unloaded relationship on
+    the results raises instead of silently issuing one SELECT per row.
+    """
+    return (raiseload("*"),) if settings.db_raiseload else ()
@@ -1,4 +1,6 @@
-from typing import Generator
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncGenerator, Callable, TypeVar
 from sqlalchemy.orm import Session as DBSession
 from sqlalchemy import inspect, text
 
@@ -6,58 +8,86 @@ from backend.database import get_engine, get_session_maker, Base
 from backend.config import Settings
 
 
-def migrate_add_pinned_column(engine) -> None:
-    """Add pinned column to conversations table if it doesn't exist (idempotent)."""
-    inspector = inspect(engine)
-    # Check if conversations table exists first
-    if "conversations" not in inspector.get_table_names():
-        return
-    columns = [c["name"] for c in inspector.get_columns("conversations")]
-    if "pinned" not in columns:
-        with engine.connect() as conn:
-            conn.execute(
-                text("ALTER TABLE conversations ADD COLUMN pinned BOOLEAN DEFAULT 0 NOT NULL")
-            )
-            conn.commit()
-
-
-def migrate_add_knowledge_vault_columns(engine) -> None:
-    """Add document_scope and persona_id columns to conversations (idempotent)."""
-    inspector = inspect(engine)
+# Columns added to conversations after its first release: (name, DDL type)
+CONVERSATION_COLUMN_MIGRATIONS = (
+    ("pinned", "BOOLEAN DEFAULT 0 NOT NULL"),
+    ("document_scope", "TEXT"),
+    ("persona_id", "INTEGER"),
+)
+
+# Indexes added after their table's first release: (table, name, columns)
+INDEX_MIGRATIONS = (
+    ("messages", "ix_messages_conversation_created", "conversation_id, created_at"),
+    ("conversations", "ix_conversations_user_pinned_updated", "user_id, pinned, updated_at"),
+)
 
-    # Check if conversations table exists first
-    if "conversations" not in inspector.get_table_names():
-        return
 
-    columns = [c["name"] for c in inspector.get_columns("conversations")]
+def run_migrations(engine) -> None:
+    """Bring an existing database up to the current schema (idempotent).
+
+    The schema is inspected once and only the missing pieces are applied,
+    all inside a single transaction, so a boot against an up-to-date
+    database issues no DDL writes.
+    """
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+
+    with engine.begin() as conn:
+        if "conversations" in tables:
+            columns = {c["name"] for c in inspector.get_columns("conversations")}
+            for name, ddl in CONVERSATION_COLUMN_MIGRATIONS:
+                if name not in columns:
+                    conn.execute(text(f"ALTER TABLE conversations ADD COLUMN {name} {ddl}"))
 
-    with engine.connect() as conn:
-        if "document_scope" not in columns:
-            conn.execute(
-                text("ALTER TABLE conversations ADD COLUMN document_scope TEXT")
-            )
-        if "persona_id" not in columns:
-            conn.execute(
-                text("ALTER TABLE conversations ADD COLUMN persona_id INTEGER")
-            )
-        conn.commit()
+        indexes: dict[str, set[str]] = {}
+        for table, name, columns in INDEX_MIGRATIONS:
+            if table not in tables:
+                continue
+            if table not in indexes:
+                indexes[table] = {ix["name"] for ix in inspector.get_indexes(table)}
+            if name not in indexes[table]:
+                conn.execute(text(f"CREATE INDEX {name} ON {table} ({columns})"))
 
 
 settings = Settings()
 engine = get_engine(settings.database_url)
 SessionLocal = get_session_maker(engine)
 
-# Create tables
-Base.metadata.create_all(bind=engine)
 
-# Run migrations
-migrate_add_pinned_column(engine)
-migrate_add_knowledge_vault_columns(engine)
+def init_db() -> None:
+    """Create missing tables and run migrations (called from the app lifespan)."""
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
 
 
-def get_db() -> Generator[DBSession, None, None]:
+async def get_db() -> AsyncGenerator[DBSession, None]:
+    # Async so FastAPI runs it on the event loop: a sync generator dependency
+    # costs a threadpool hop on entry and another on exit. Creating a Session
+    # does no I/O (connections are checked out on first query), and FastAPI
+    # caches the dependency so every Depends(get_db) in a request shares it.
+    # close() does block: it rolls back any open transaction and returns the
+    # connection to the pool. Against local SQLite that is a ROLLBACK on an
+    # in-process connection (microseconds, no network), cheaper than the
+    # thread hop it would take to move it off the loop.
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+T = TypeVar("T")
+
+# Writes made from async code (the chat stream persisting user and assistant
+# messages) run on one dedicated worker thread. That keeps the blocking
+# commit off the event loop and queues concurrent chat streams behind each
+# other instead of racing for SQLite's write lock. It is not a global single
+# writer: sync routes still commit from Starlette's threadpool and rely on
+# SQLite's own locking (pysqlite waits up to 5s for the lock).
+_db_write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gantry-db-write")
+
+
+async def run_db_write(fn: Callable[..., T], *args) -> T:
+    """Run a blocking DB write from async code on the dedicated writer thread."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_db_write_executor, fn, *args)
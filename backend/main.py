@@ -1,9 +1,24 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
+from backend.dependencies import init_db
 from backend.routers import admin, auth, chat, documents, models, overlord, personas
+from backend.services.http_client import close_http_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema setup is blocking SQLite I/O; keep it off the event loop
+    await asyncio.to_thread(init_db)
+    yield
+    # Release pooled upstream connections on shutdown
+    await close_http_client()
 
-app = FastAPI(title="Nebulus Gantry", version="2.0.0")
+
+app = FastAPI(title="Nebulus Gantry", version="2.0.0", lifespan=lifespan)
 
 # CORS
 app.add_middleware(
@@ -24,6 +39,10 @@ app.include_router(overlord.router)
 app.include_router(personas.router)
 
 
+# Static body, encoded once: container health checks poll this endpoint
+HEALTH_BODY = b'{"status":"healthy"}'
+
+
 @app.get("/health")
-def health_check():
-    return {"status": "healthy"}
+async def health_check():
+    return Response(content=HEALTH_BODY, media_type="application/json")
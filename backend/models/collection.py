@@ -1,8 +1,7 @@
-from datetime import datetime, timezone
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean
 from sqlalchemy.orm import relationship
 
-from backend.database import Base
+from backend.database import Base, utcnow
 
 
 class Collection(Base):
@@ -15,9 +14,16 @@ class Collection(Base):
     name = Column(String(100), nullable=False)
     description = Column(String(500), nullable=True)
     is_default = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime, default=utcnow)
 
+    # Loading strategy: a collection's documents are read whenever the
+    # collection is rendered (document_count) or deleted, so they are fetched
+    # with one SELECT ... IN for the whole result set instead of one lazy
+    # SELECT per collection.
     user = relationship("User", backref="collections")
     documents = relationship(
-        "Document", back_populates="collection", cascade="all, delete-orphan"
+        "Document",
+        back_populates="collection",
+        cascade="all, delete-orphan",
+        lazy="selectin",
     )
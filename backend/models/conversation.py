@@ -1,11 +1,15 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Text, Index
 from sqlalchemy.orm import relationship
 from backend.database import Base
 
 
 class Conversation(Base):
     __tablename__ = "conversations"
+    # Serves the sidebar list: a user's threads, pinned first, newest first
+    __table_args__ = (
+        Index("ix_conversations_user_pinned_updated", "user_id", "pinned", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -24,6 +28,9 @@ class Conversation(Base):
 
     user = relationship("User", backref="conversations")
     messages = relationship(
-        "Message", back_populates="conversation", cascade="all, delete-orphan"
+        "Message",
+        back_populates="conversation",
+        cascade="all, delete-orphan",
+        order_by="Message.created_at",
     )
     persona = relationship("Persona")
@@ -1,8 +1,7 @@
-from datetime import datetime, timezone
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
 from sqlalchemy.orm import relationship
 
-from backend.database import Base
+from backend.database import Base, utcnow
 
 
 class Document(Base):
@@ -21,7 +20,7 @@ class Document(Base):
     chunk_count = Column(Integer, default=0)
     status = Column(String(20), default="processing")  # processing, ready, failed
     error_message = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime, default=utcnow)
 
     user = relationship("User", backref="documents")
     collection = relationship("Collection", back_populates="documents")
@@ -1,8 +1,7 @@
-from datetime import datetime, timezone
 from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Text
 from sqlalchemy.orm import relationship
 
-from backend.database import Base
+from backend.database import Base, utcnow
 
 
 class Persona(Base):
@@ -20,6 +19,6 @@ class Persona(Base):
     temperature = Column(Float, default=0.7)
     model_id = Column(String(100), nullable=True)  # Optional preferred model
     is_default = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime, default=utcnow)
 
     user = relationship("User", backref="personas")
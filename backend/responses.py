@@ -0,0 +1,39 @@
+"""Response classes shared by the API routers."""
+import hashlib
+from typing import Any
+
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson.
+
+    Use on routes that return plain dicts/lists without a ``response_model``.
+    Routes with a response model are already serialized to bytes by Pydantic
+    and should keep FastAPI's default response class.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def etag_json_response(request: Request, content: Any) -> Response:
+    """Serialize ``content`` with an ETag, answering 304 when it matches.
+
+    For endpoints the UI polls: an unchanged payload costs the client a
+    bodiless 304 instead of a full download and re-parse. Responses are
+    per-user, so they are marked private and must be revalidated.
+    """
+    body = orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in candidates or "*" in candidates:
+            return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -7,6 +7,7 @@ from fastapi.responses import StreamingResponse, Response
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session as DBSession
 
+from backend.database import read_only_load_options
 from backend.dependencies import get_db
 from backend.models.session import Session
 from backend.models.user import User
@@ -26,7 +27,12 @@ from backend.schemas.admin import (
     UserAdminResponse,
     UserListResponse,
 )
-from backend.services.auth_service import AuthService, hash_password
+from backend.services.auth_service import (
+    AuthService,
+    forget_failed_logins,
+    hash_password,
+    invalidate_session_cache,
+)
 from backend.services.docker_service import DockerService
 from backend.services.model_service import ModelService
 from backend.services.persona_service import PersonaService
@@ -60,7 +66,7 @@ def list_users(
     admin=Depends(require_admin),
 ):
     """List all users (does not return password hashes)."""
-    users = db.query(User).all()
+    users = db.query(User).options(*read_only_load_options()).all()
     return UserListResponse(users=users)
 
 
@@ -93,7 +99,7 @@ def update_user(
     admin=Depends(require_admin),
 ):
     """Update a user's display name, role, or password."""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     if request.display_name is not None:
@@ -103,7 +109,9 @@ def update_user(
     if request.password is not None:
         user.password_hash = hash_password(request.password)
     db.commit()
-    db.refresh(user)
+    invalidate_session_cache(user_id=user_id)
+    if request.password is not None:
+        forget_failed_logins(user.email)
     return user
 
 
@@ -116,13 +124,14 @@ def delete_user(
     """Delete a user by ID. Cannot delete yourself."""
     if user_id == admin.id:
         raise HTTPException(status_code=400, detail="Cannot delete yourself")
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     # Delete associated sessions first to avoid FK constraint violations
     db.query(Session).filter(Session.user_id == user_id).delete()
     db.delete(user)
     db.commit()
+    invalidate_session_cache(user_id=user_id)
     return DeleteUserResponse(message=f"User {user.email} deleted")
 
 
@@ -2,7 +2,8 @@ from fastapi import APIRouter, Depends, HTTPException, Response, Request
 from sqlalchemy.orm import Session as DBSession
 
 from backend.dependencies import get_db
-from backend.services.auth_service import AuthService, hash_password, verify_password
+from backend.models.user import User
+from backend.services.auth_service import AuthService, forget_failed_logins, hash_password, verify_password
 from backend.schemas.auth import ChangePasswordRequest, LoginRequest, UserResponse
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
@@ -16,7 +17,7 @@ def get_current_user(request: Request, auth: AuthService = Depends(get_auth_serv
     token = request.cookies.get("session_token")
     if not token:
         raise HTTPException(status_code=401, detail="Not authenticated")
-    user = auth.validate_session(token)
+    user = auth.get_session_user(token)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid or expired session")
     return user
@@ -62,8 +63,10 @@ def change_password(
 
     Requires the current password for verification.
     """
-    if not verify_password(data.current_password, user.password_hash):
+    account = db.get(User, user.id)
+    if not verify_password(data.current_password, account.password_hash):
         raise HTTPException(status_code=400, detail="Current password is incorrect")
-    user.password_hash = hash_password(data.new_password)
+    account.password_hash = hash_password(data.new_password)
     db.commit()
+    forget_failed_logins(account.email)
     return {"message": "Password changed successfully"}
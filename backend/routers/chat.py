@@ -1,13 +1,15 @@
+import asyncio
 import json
 import logging
 import time
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import StreamingResponse, JSONResponse, Response
+from fastapi.responses import StreamingResponse, Response
 from pydantic import BaseModel
 from sqlalchemy.orm import Session as DBSession
 
-from backend.dependencies import get_db
+from backend.dependencies import get_db, run_db_write
+from backend.responses import ORJSONResponse
 from backend.routers.auth import get_current_user
 from backend.services.chat_service import ChatService
 from backend.services.llm_service import LLMService
@@ -25,6 +27,11 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/chat", tags=["chat"])
 
+# Streamed LLM deltas are coalesced into larger response chunks: flush once
+# the buffer reaches this many characters or this many seconds have passed.
+STREAM_FLUSH_CHARS = 48
+STREAM_FLUSH_INTERVAL = 0.05
+
 
 def get_chat_service(db: DBSession = Depends(get_db)) -> ChatService:
     return ChatService(db)
@@ -65,6 +72,22 @@ def _create_memory_service(user_id: int):
     return MemoryService(user_id)
 
 
+async def _search_memory(user_id: int, query: str) -> tuple:
+    """Open the user's MemoryService and fetch similar past messages.
+
+    Returns (memory_service, similar_messages). The service is None if it
+    could not be created; failures degrade to an empty result list.
+    """
+    memory_service = None
+    try:
+        # Connecting may block on ChromaDB's HTTP client
+        memory_service = await asyncio.to_thread(_create_memory_service, user_id)
+        return memory_service, await memory_service.search_similar(query, limit=3)
+    except Exception as e:
+        logger.warning(f"MemoryService query failed: {e}")
+        return memory_service, []
+
+
 def _create_graph_service(user_id: int):
     """Factory for GraphService. Lazy import to handle missing networkx gracefully."""
     from backend.services.graph_service import GraphService
@@ -90,22 +113,32 @@ def search_conversations(
     chat: ChatService = Depends(get_chat_service),
 ):
     """Search messages and conversation titles across the user's conversations."""
-    if not q or not q.strip():
+    query = q.strip() if q else ""
+    if not query:
         return SearchResponse(results=[])
+    lower_q = query.lower()
 
     from sqlalchemy import or_
     from backend.models.message import Message
     from backend.models.conversation import Conversation
 
-    # Search messages belonging to user's conversations (message content OR title match)
+    # Search messages belonging to user's conversations (message content OR title match).
+    # Only the columns needed for the response are selected, which skips ORM
+    # hydration and the per-row lazy load of msg.conversation.
     results = (
-        chat.db.query(Message)
+        chat.db.query(
+            Message.content,
+            Message.role,
+            Message.created_at,
+            Conversation.id,
+            Conversation.title,
+        )
         .join(Conversation, Message.conversation_id == Conversation.id)
         .filter(
             Conversation.user_id == user.id,
             or_(
-                Message.content.ilike(f"%{q.strip()}%"),
-                Conversation.title.ilike(f"%{q.strip()}%"),
+                Message.content.ilike(f"%{query}%"),
+                Conversation.title.ilike(f"%{query}%"),
             ),
         )
         .order_by(Message.created_at.desc())
@@ -115,17 +148,12 @@ def search_conversations(
 
     # Build response with snippets
     search_results = []
-    for msg in results:
-        conversation = msg.conversation
-
+    for content, role, created_at, conversation_id, conversation_title in results:
         # Create a snippet around the matched text
-        content = msg.content
-        lower_content = content.lower()
-        lower_q = q.strip().lower()
-        idx = lower_content.find(lower_q)
+        idx = content.lower().find(lower_q)
         if idx != -1:
             start = max(0, idx - 60)
-            end = min(len(content), idx + len(q.strip()) + 60)
+            end = min(len(content), idx + len(query) + 60)
             snippet = content[start:end]
             if start > 0:
                 snippet = "..." + snippet
@@ -138,11 +166,11 @@ def search_conversations(
 
         search_results.append(
             SearchResult(
-                conversation_id=conversation.id,
-                conversation_title=conversation.title,
+                conversation_id=conversation_id,
+                conversation_title=conversation_title,
                 message_snippet=snippet,
-                role=msg.role,
-                created_at=msg.created_at.isoformat(),
+                role=role,
+                created_at=created_at.isoformat(),
             )
         )
 
@@ -159,10 +187,12 @@ def create_conversation(
 
 @router.get("/conversations", response_model=list[ConversationResponse])
 def list_conversations(
+    limit: int | None = Query(default=None, ge=1, le=500),
     user=Depends(get_current_user),
     chat: ChatService = Depends(get_chat_service),
 ):
-    return chat.get_conversations(user.id)
+    """List the user's conversations, pinned first, most recently updated first."""
+    return chat.get_conversations(user.id, limit=limit)
 
 
 @router.get("/conversations/{conversation_id}", response_model=ConversationDetailResponse)
@@ -171,11 +201,10 @@ def get_conversation(
     user=Depends(get_current_user),
     chat: ChatService = Depends(get_chat_service),
 ):
-    conversation = chat.get_conversation(conversation_id, user.id)
+    conversation = chat.get_conversation_with_messages(conversation_id, user.id)
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
-    messages = chat.get_messages(conversation_id)
-    return {"conversation": conversation, "messages": messages}
+    return {"conversation": conversation, "messages": conversation.messages}
 
 
 @router.delete("/conversations/{conversation_id}")
@@ -226,7 +255,7 @@ def export_conversation(
         data = export_service.export_json(conversation_id, user.id)
         if not data:
             raise HTTPException(status_code=404, detail="Conversation not found")
-        return JSONResponse(
+        return ORJSONResponse(
             content=data,
             headers={
                 "Content-Disposition": f"attachment; filename=conversation-{conversation_id}.json"
@@ -259,23 +288,19 @@ async def send_message(  # noqa: C901
         raise HTTPException(status_code=404, detail="Conversation not found")
 
     # Save user message
-    user_msg = chat.add_message(conversation_id, "user", request.content)
+    user_msg = await run_db_write(chat.add_message, conversation_id, "user", request.content)
 
     # --- LTM: Query long-term memory for context ---
-    memory_service = None
+    # The TabbyAPI active-model lookup is started first so its round-trip
+    # overlaps the ChromaDB query instead of running after it.
+    model_service = ModelService()
+    active_model, (memory_service, similar_messages) = await asyncio.gather(
+        model_service.get_active_model(),
+        _search_memory(user.id, request.content),
+    )
+
     graph_service = None
-    similar_messages = []
     related_facts = []
-
-    try:
-        memory_service = _create_memory_service(user.id)
-        similar_messages = await memory_service.search_similar(
-            request.content, limit=3
-        )
-    except Exception as e:
-        logger.warning(f"MemoryService query failed: {e}")
-        similar_messages = []
-
     try:
         graph_service = _create_graph_service(user.id)
         entities = graph_service.extract_entities(request.content)
@@ -317,21 +342,19 @@ async def send_message(  # noqa: C901
             logger.warning(f"Failed to load persona: {e}")
 
     # Ensure requested model is loaded (auto-switch if needed)
-    model_service = ModelService()
-    if request.model:
+    if request.model and (not active_model or active_model["id"] != request.model):
+        logger.info(f"Switching model from {active_model['id'] if active_model else 'none'} to {request.model}")
+        switch_success = await model_service.switch_model(request.model)
+        if not switch_success:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to load model '{request.model}'. Please try again or select a different model."
+            )
+        logger.info(f"Model switched successfully to {request.model}")
+        # Re-query only after a switch; otherwise the lookup above is current
         active_model = await model_service.get_active_model()
-        if not active_model or active_model["id"] != request.model:
-            logger.info(f"Switching model from {active_model['id'] if active_model else 'none'} to {request.model}")
-            switch_success = await model_service.switch_model(request.model)
-            if not switch_success:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Failed to load model '{request.model}'. Please try again or select a different model."
-                )
-            logger.info(f"Model switched successfully to {request.model}")
-
-    # Query active model name for system prompt
-    active_model = await model_service.get_active_model()
+
+    # Active model name for system prompt
     model_name = active_model["name"] if active_model else "an AI assistant"
 
     # Build system message
@@ -364,13 +387,23 @@ async def send_message(  # noqa: C901
     llm_model = request.model or "default"
 
     async def generate():
-        full_response = ""
+        response_parts: list[str] = []
+        buffer = ""
         start_time = time.monotonic()
+        last_flush = start_time
         async for chunk in llm.stream_chat(
             llm_messages, model=llm_model, temperature=persona_temperature
         ):
-            full_response += chunk
-            yield chunk
+            response_parts.append(chunk)
+            buffer += chunk
+            now = time.monotonic()
+            if len(buffer) >= STREAM_FLUSH_CHARS or now - last_flush >= STREAM_FLUSH_INTERVAL:
+                yield buffer
+                buffer = ""
+                last_flush = now
+        if buffer:
+            yield buffer
+        full_response = "".join(response_parts)
 
         generation_time_ms = int((time.monotonic() - start_time) * 1000)
 
@@ -383,35 +416,24 @@ async def send_message(  # noqa: C901
         yield f"\n\n__META__{json.dumps(meta)}"
 
         # Save assistant response after streaming completes
-        assistant_msg = chat.add_message(conversation_id, "assistant", full_response)
+        assistant_msg = await run_db_write(chat.add_message, conversation_id, "assistant", full_response)
 
         # --- LTM: Update long-term memory asynchronously ---
-        # Embed user message into ChromaDB
+        # Embed both sides of the exchange into ChromaDB in one batch
         if memory_service is not None:
             try:
-                await memory_service.embed_message(
-                    message_id=user_msg.id,
-                    content=request.content,
-                    metadata={
+                await memory_service.embed_messages([
+                    (user_msg.id, request.content, {
                         "conversation_id": str(conversation_id),
                         "role": "user",
-                    },
-                )
-            except Exception as e:
-                logger.warning(f"Failed to embed user message: {e}")
-
-            # Embed assistant message into ChromaDB
-            try:
-                await memory_service.embed_message(
-                    message_id=assistant_msg.id,
-                    content=full_response,
-                    metadata={
+                    }),
+                    (assistant_msg.id, full_response, {
                         "conversation_id": str(conversation_id),
                         "role": "assistant",
-                    },
-                )
+                    }),
+                ])
             except Exception as e:
-                logger.warning(f"Failed to embed assistant message: {e}")
+                logger.warning(f"Failed to embed messages: {e}")
 
         # Extract entities and update knowledge graph
         if graph_service is not None:
@@ -475,5 +497,4 @@ def set_conversation_document_scope(
         conversation.document_scope = None
 
     chat.db.commit()
-    chat.db.refresh(conversation)
     return conversation
@@ -3,6 +3,7 @@ Documents Router for Knowledge Vault.
 
 Endpoints for managing collections and documents.
 """
+import asyncio
 import logging
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
 from sqlalchemy.orm import Session as DBSession
@@ -111,6 +112,15 @@ ALLOWED_CONTENT_TYPES = {
     "application/vnd.openxmlformats-officedocument.wordprocessingml.document": "docx",
 }
 
+# Fallback when the browser sends a generic or missing content type
+ALLOWED_EXTENSIONS = {
+    "pdf": "pdf",
+    "txt": "txt",
+    "text": "txt",
+    "csv": "csv",
+    "docx": "docx",
+}
+
 
 @router.post("/upload", response_model=DocumentResponse)
 async def upload_document(
@@ -121,26 +131,17 @@ async def upload_document(
 ):
     """Upload a document to the knowledge vault."""
     # Validate content type
-    content_type = file.content_type or ""
-    if content_type not in ALLOWED_CONTENT_TYPES:
+    doc_type = ALLOWED_CONTENT_TYPES.get(file.content_type or "")
+    if doc_type is None:
         # Try to infer from filename
         filename = file.filename or ""
         ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
-        if ext == "pdf":
-            doc_type = "pdf"
-        elif ext in ("txt", "text"):
-            doc_type = "txt"
-        elif ext == "csv":
-            doc_type = "csv"
-        elif ext == "docx":
-            doc_type = "docx"
-        else:
-            raise HTTPException(
-                status_code=400,
-                detail="Unsupported file type. Allowed: PDF, TXT, CSV, DOCX",
-            )
-    else:
-        doc_type = ALLOWED_CONTENT_TYPES[content_type]
+        doc_type = ALLOWED_EXTENSIONS.get(ext)
+    if doc_type is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Unsupported file type. Allowed: PDF, TXT, CSV, DOCX",
+        )
 
     # Read file content
     content = await file.read()
@@ -153,8 +154,11 @@ async def upload_document(
             detail="File too large. Maximum size is 10MB.",
         )
 
+    # Text extraction, chunking and embedding are CPU-bound and synchronous;
+    # run them off the event loop so other requests keep being served.
     try:
-        document = service.upload_document(
+        document = await asyncio.to_thread(
+            service.upload_document,
             user_id=user.id,
             filename=file.filename or "unnamed",
             content=content,
@@ -7,8 +7,9 @@ Admin-only operations (load, unload) remain in admin.py.
 
 import logging
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 
+from backend.responses import etag_json_response
 from backend.routers.auth import get_current_user
 from backend.services.model_service import ModelService
 
@@ -20,20 +21,22 @@ _model_service = ModelService()
 
 
 @router.get("")
-async def list_models(user=Depends(get_current_user)):
+async def list_models(request: Request, user=Depends(get_current_user)):
     """List available models with active flag.
 
     Any authenticated user can query this to populate the model switcher.
+    Supports If-None-Match: an unchanged list is answered with 304.
     """
     models = await _model_service.list_models()
-    return {"models": models}
+    return etag_json_response(request, {"models": models})
 
 
 @router.get("/active")
-async def get_active_model(user=Depends(get_current_user)):
+async def get_active_model(request: Request, user=Depends(get_current_user)):
     """Get the currently loaded model.
 
     Returns the model name/id or null if no model is loaded.
+    Supports If-None-Match: an unchanged answer is answered with 304.
     """
     model = await _model_service.get_active_model()
-    return {"model": model}
+    return etag_json_response(request, {"model": model})
@@ -1,11 +1,91 @@
+import hmac
 import secrets
+import threading
+import time
 import bcrypt
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from sqlalchemy.orm import Session as DBSession
+from sqlalchemy.orm import Session as DBSession, joinedload
 
 from backend.models.user import User
 from backend.models.session import Session
-from backend.config import Settings
+from backend.config import settings
+
+
+# get_current_user resolves the session cookie on every authenticated
+# request. Resolved sessions are cached briefly as detached snapshots so
+# repeat requests skip the database; logout and admin changes to a user
+# evict the affected entries immediately.
+SESSION_CACHE_TTL = 60.0
+SESSION_CACHE_MAX_SIZE = 4096
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """Detached snapshot of the authenticated user.
+
+    Carries the columns routes read from the current user. It is not bound
+    to a DB session, so it can be shared across requests; load the User row
+    explicitly when it needs to be modified.
+    """
+    id: int
+    email: str
+    display_name: str
+    role: str
+
+
+# token -> (cached until [monotonic], session expires_at [naive UTC], user)
+_session_cache: dict[str, tuple[float, datetime, CurrentUser]] = {}
+_session_cache_lock = threading.Lock()
+
+
+def invalidate_session_cache(token: str | None = None, user_id: int | None = None) -> None:
+    """Evict cached sessions by token and/or user id; no arguments clears all."""
+    with _session_cache_lock:
+        if token is None and user_id is None:
+            _session_cache.clear()
+            return
+        if token is not None:
+            _session_cache.pop(token, None)
+        if user_id is not None:
+            stale = [key for key, (_, _, user) in _session_cache.items() if user.id == user_id]
+            for key in stale:
+                del _session_cache[key]
+
+
+# A bcrypt check costs tens of milliseconds of CPU. Failed logins are
+# remembered for a few seconds, keyed by email and a keyed hash of the
+# attempted password, so a burst retrying the same bad credentials is
+# rejected without re-hashing. Successful logins are never cached.
+FAILED_LOGIN_CACHE_TTL = 5.0
+FAILED_LOGIN_CACHE_MAX_SIZE = 1024
+
+# Attempted passwords are often near-misses of the real one. The per-process
+# random key keeps the remembered digests useless for offline dictionary
+# checks if the process memory is ever exposed.
+_FAILED_LOGIN_KEY = secrets.token_bytes(32)
+
+# (email, hmac-sha256(password)) -> remembered until [monotonic]
+_failed_logins: dict[tuple[str, bytes], float] = {}
+_failed_logins_lock = threading.Lock()
+
+
+def _failed_login_key(email: str, password: str) -> tuple[str, bytes]:
+    return email, hmac.new(_FAILED_LOGIN_KEY, password.encode("utf-8"), "sha256").digest()
+
+
+def forget_failed_logins(email: str | None = None) -> None:
+    """Drop remembered failed logins for one email; no argument clears all."""
+    with _failed_logins_lock:
+        if email is None:
+            _failed_logins.clear()
+            return
+        for key in [key for key in _failed_logins if key[0] == email]:
+            del _failed_logins[key]
+
+
+def _new_session_token() -> str:
+    return secrets.token_urlsafe(32)
 
 
 def hash_password(password: str) -> str:
@@ -19,7 +99,7 @@ def verify_password(password: str, password_hash: str) -> bool:
 class AuthService:
     def __init__(self, db: DBSession):
         self.db = db
-        self.settings = Settings()
+        self.settings = settings
 
     def create_user(self, email: str, password: str, display_name: str, role: str = "user") -> User:
         password_hash = hash_password(password)
@@ -31,19 +111,29 @@ class AuthService:
         )
         self.db.add(user)
         self.db.commit()
-        self.db.refresh(user)
         return user
 
     def authenticate(self, email: str, password: str) -> User | None:
+        key = _failed_login_key(email, password)
+        now = time.monotonic()
+        with _failed_logins_lock:
+            remembered_until = _failed_logins.get(key)
+        if remembered_until is not None and now < remembered_until:
+            return None
+
         user = self.db.query(User).filter(User.email == email).first()
         if not user:
             return None
         if not verify_password(password, user.password_hash):
+            with _failed_logins_lock:
+                if key not in _failed_logins and len(_failed_logins) >= FAILED_LOGIN_CACHE_MAX_SIZE:
+                    _failed_logins.pop(next(iter(_failed_logins)))
+                _failed_logins[key] = now + FAILED_LOGIN_CACHE_TTL
             return None
         return user
 
     def create_session(self, user_id: int) -> str:
-        token = secrets.token_urlsafe(32)
+        token = _new_session_token()
         # Use naive UTC datetime for SQLite compatibility
         expires_at = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(hours=self.settings.session_expire_hours)
         session = Session(user_id=user_id, token=token, expires_at=expires_at)
@@ -51,17 +141,56 @@ class AuthService:
         self.db.commit()
         return token
 
-    def validate_session(self, token: str) -> User | None:
-        session = self.db.query(Session).filter(Session.token == token).first()
+    def _find_valid_session(self, token: str) -> Session | None:
+        # Fetch the user in the same query instead of a second lazy load
+        # through session.user.
+        session = (
+            self.db.query(Session)
+            .options(joinedload(Session.user))
+            .filter(Session.token == token)
+            .first()
+        )
         if not session:
             return None
         if session.expires_at < datetime.now(timezone.utc).replace(tzinfo=None):
             self.db.delete(session)
             self.db.commit()
             return None
-        return session.user
+        return session
+
+    def validate_session(self, token: str) -> User | None:
+        session = self._find_valid_session(token)
+        return session.user if session else None
+
+    def get_session_user(self, token: str) -> CurrentUser | None:
+        """Resolve a session token to a CurrentUser, served from cache when fresh."""
+        now = time.monotonic()
+        with _session_cache_lock:
+            entry = _session_cache.get(token)
+        if entry is not None:
+            cached_until, expires_at, user = entry
+            if now < cached_until and datetime.now(timezone.utc).replace(tzinfo=None) < expires_at:
+                return user
+            invalidate_session_cache(token=token)
+
+        session = self._find_valid_session(token)
+        if not session:
+            return None
+        user = CurrentUser(
+            id=session.user.id,
+            email=session.user.email,
+            display_name=session.user.display_name,
+            role=session.user.role,
+        )
+        with _session_cache_lock:
+            if token not in _session_cache and len(_session_cache) >= SESSION_CACHE_MAX_SIZE:
+                # Evict the oldest entry (dicts keep insertion order)
+                _session_cache.pop(next(iter(_session_cache)))
+            _session_cache[token] = (now + SESSION_CACHE_TTL, session.expires_at, user)
+        return user
 
     def delete_session(self, token: str) -> bool:
+        invalidate_session_cache(token=token)
         session = self.db.query(Session).filter(Session.token == token).first()
         if session:
             self.db.delete(session)
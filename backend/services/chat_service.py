@@ -1,5 +1,9 @@
-from sqlalchemy.orm import Session as DBSession
+from datetime import datetime, timezone
 
+from sqlalchemy import select
+from sqlalchemy.orm import Session as DBSession, joinedload
+
+from backend.database import read_only_load_options
 from backend.models.conversation import Conversation
 from backend.models.message import Message
 
@@ -12,50 +16,66 @@ class ChatService:
         conversation = Conversation(user_id=user_id, title=title)
         self.db.add(conversation)
         self.db.commit()
-        self.db.refresh(conversation)
         return conversation
 
-    def get_conversations(self, user_id: int) -> list[Conversation]:
-        return (
+    def get_conversations(self, user_id: int, limit: int | None = None) -> list[Conversation]:
+        query = (
             self.db.query(Conversation)
+            .options(*read_only_load_options())
             .filter(Conversation.user_id == user_id)
             .order_by(Conversation.pinned.desc(), Conversation.updated_at.desc())
-            .all()
         )
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
 
     def get_conversation(self, conversation_id: int, user_id: int) -> Conversation | None:
+        # Primary-key lookup: served from the identity map when already loaded
+        conversation = self.db.get(Conversation, conversation_id)
+        if conversation is None or conversation.user_id != user_id:
+            return None
+        return conversation
+
+    def get_conversation_with_messages(self, conversation_id: int, user_id: int) -> Conversation | None:
+        """Load a conversation and its messages (oldest first) in one query."""
         return (
             self.db.query(Conversation)
+            .options(joinedload(Conversation.messages), *read_only_load_options())
             .filter(Conversation.id == conversation_id, Conversation.user_id == user_id)
             .first()
         )
 
     def delete_conversation(self, conversation_id: int, user_id: int) -> bool:
-        conversation = self.get_conversation(conversation_id, user_id)
-        if not conversation:
-            return False
-        self.db.delete(conversation)
+        # Bulk deletes instead of the ORM cascade, which would load and
+        # delete every message row one at a time.
+        owned = select(Conversation.id).where(
+            Conversation.id == conversation_id, Conversation.user_id == user_id
+        )
+        self.db.query(Message).filter(
+            Message.conversation_id.in_(owned)
+        ).delete(synchronize_session=False)
+        deleted = self.db.query(Conversation).filter(
+            Conversation.id == conversation_id, Conversation.user_id == user_id
+        ).delete()
         self.db.commit()
-        return True
+        return deleted > 0
 
     def update_title(self, conversation_id: int, title: str) -> None:
-        conversation = self.db.query(Conversation).filter(
-            Conversation.id == conversation_id
-        ).first()
+        conversation = self.db.get(Conversation, conversation_id)
         if conversation:
             conversation.title = title
             self.db.commit()
 
     def add_message(self, conversation_id: int, role: str, content: str) -> Message:
-        message = Message(conversation_id=conversation_id, role=role, content=content)
+        # One timestamp for both rows. Use naive UTC datetime for SQLite compatibility
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        message = Message(conversation_id=conversation_id, role=role, content=content, created_at=now)
         self.db.add(message)
 
         # Update conversation's updated_at and auto-title on first user message
-        conversation = self.db.query(Conversation).filter(Conversation.id == conversation_id).first()
+        conversation = self.db.get(Conversation, conversation_id)
         if conversation:
-            from datetime import datetime, timezone
-            # Use naive UTC datetime for SQLite compatibility
-            conversation.updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
+            conversation.updated_at = now
 
             if role == "user" and conversation.title == "New Thread":
                 title = content.strip()[:60]
@@ -64,12 +84,12 @@ class ChatService:
                 conversation.title = title
 
         self.db.commit()
-        self.db.refresh(message)
         return message
 
     def get_messages(self, conversation_id: int) -> list[Message]:
         return (
             self.db.query(Message)
+            .options(*read_only_load_options())
             .filter(Message.conversation_id == conversation_id)
             .order_by(Message.created_at.asc())
             .all()
@@ -81,5 +101,4 @@ class ChatService:
         if conv:
             conv.pinned = not conv.pinned
             self.db.commit()
-            self.db.refresh(conv)
         return conv
@@ -6,10 +6,15 @@ Gracefully degrades when Docker is not available (e.g., in CI or dev environment
 
 import docker
 import logging
+import time
 from typing import Generator
 
 logger = logging.getLogger(__name__)
 
+# The admin panel polls the service list; container states only need to be
+# seconds-fresh, so concurrent polls share one Docker API listing.
+SERVICES_CACHE_TTL = 5.0
+
 
 class DockerService:
     def __init__(self):
@@ -20,6 +25,7 @@ class DockerService:
             logger.warning(f"Docker not available: {e}")
             self.client = None
             self._available = False
+        self._services_cache: tuple[float, list[dict]] | None = None
 
     @property
     def available(self) -> bool:
@@ -29,6 +35,9 @@ class DockerService:
         """List Nebulus-related containers."""
         if not self.available:
             return []
+        now = time.monotonic()
+        if self._services_cache is not None and self._services_cache[0] > now:
+            return list(self._services_cache[1])
         try:
             containers = self.client.containers.list(all=True)
             services = []
@@ -45,7 +54,8 @@ class DockerService:
                             "container_id": c.short_id,
                         }
                     )
-            return services
+            self._services_cache = (now + SERVICES_CACHE_TTL, services)
+            return list(services)
         except Exception as e:
             logger.warning(f"Failed to list services: {e}")
             return []
@@ -61,6 +71,8 @@ class DockerService:
             if not containers:
                 return False
             containers[0].restart()
+            # The cached listing still shows the pre-restart status
+            self._services_cache = None
             return True
         except Exception as e:
             logger.warning(f"Failed to restart {service_name}: {e}")
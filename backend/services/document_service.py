@@ -8,14 +8,15 @@ Provides:
 - Chunking and embedding into ChromaDB
 - Semantic search across documents
 """
+import hashlib
 import io
 import logging
-from typing import Optional
+import threading
+from collections import OrderedDict
 
-import chromadb
 from sqlalchemy.orm import Session as DBSession
 
-from backend.config import Settings
+from backend.config import parse_chroma_host, settings
 from backend.models.collection import Collection
 from backend.models.document import Document
 
@@ -25,9 +26,25 @@ logger = logging.getLogger(__name__)
 CHUNK_SIZE = 2000
 CHUNK_OVERLAP = 100
 
+# Extracted PDF text, keyed by a BLAKE2b digest of the file content (LRU)
+PDF_TEXT_CACHE_SIZE = 64
+_pdf_text_cache: "OrderedDict[str, str]" = OrderedDict()
+_pdf_text_cache_lock = threading.Lock()
+
 
 def extract_text_from_pdf(content: bytes) -> str:
-    """Extract text from PDF content."""
+    """Extract text from PDF content.
+
+    Results are memoized by content hash, so uploading the same file again
+    skips the PyPDF parse entirely.
+    """
+    digest = hashlib.blake2b(content).hexdigest()
+    with _pdf_text_cache_lock:
+        cached = _pdf_text_cache.get(digest)
+        if cached is not None:
+            _pdf_text_cache.move_to_end(digest)
+            return cached
+
     try:
         from pypdf import PdfReader
 
@@ -37,11 +54,17 @@ def extract_text_from_pdf(content: bytes) -> str:
             text = page.extract_text()
             if text:
                 text_parts.append(text)
-        return "\n\n".join(text_parts)
+        result = "\n\n".join(text_parts)
     except Exception as e:
         logger.error(f"Failed to extract text from PDF: {e}")
         raise ValueError(f"Failed to extract text from PDF: {e}")
 
+    with _pdf_text_cache_lock:
+        _pdf_text_cache[digest] = result
+        if len(_pdf_text_cache) > PDF_TEXT_CACHE_SIZE:
+            _pdf_text_cache.popitem(last=False)
+    return result
+
 
 def extract_text_from_docx(content: bytes) -> str:
     """Extract text from DOCX content."""
@@ -71,6 +94,15 @@ def extract_text_from_txt(content: bytes) -> str:
             raise ValueError(f"Failed to decode text file: {e}")
 
 
+# Document type (as stored on Document.content_type) -> text extractor
+TEXT_EXTRACTORS = {
+    "pdf": extract_text_from_pdf,
+    "docx": extract_text_from_docx,
+    "txt": extract_text_from_txt,
+    "csv": extract_text_from_txt,
+}
+
+
 def chunk_text(text: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> list[str]:
     """Split text into overlapping chunks."""
     if not text:
@@ -109,24 +141,16 @@ class DocumentService:
 
     def __init__(self, db: DBSession):
         self.db = db
-        self.settings = Settings()
-        self._chroma_client: Optional[chromadb.HttpClient] = None
+        self.settings = settings
+        self._chroma_client = None
         self._chroma_available = False
 
         try:
-            host_url = self.settings.chroma_host
-            if host_url.startswith("http://"):
-                host_url = host_url[7:]
-            elif host_url.startswith("https://"):
-                host_url = host_url[8:]
-
-            if ":" in host_url:
-                host, port_str = host_url.split(":", 1)
-                port = int(port_str)
-            else:
-                host = host_url
-                port = 8000
+            # Deferred so workers that never touch the Knowledge Vault skip
+            # loading chromadb (and numpy with it) at startup.
+            import chromadb
 
+            host, port = parse_chroma_host(self.settings.chroma_host)
             self._chroma_client = chromadb.HttpClient(host=host, port=port)
             self._chroma_available = True
             logger.info("DocumentService: ChromaDB connected")
@@ -162,7 +186,6 @@ class DocumentService:
         )
         self.db.add(collection)
         self.db.commit()
-        self.db.refresh(collection)
         return collection
 
     def list_collections(self, user_id: int) -> list[Collection]:
@@ -176,11 +199,10 @@ class DocumentService:
 
     def get_collection(self, collection_id: int, user_id: int) -> Collection | None:
         """Get a single collection by ID."""
-        return (
-            self.db.query(Collection)
-            .filter(Collection.id == collection_id, Collection.user_id == user_id)
-            .first()
-        )
+        collection = self.db.get(Collection, collection_id)
+        if collection is None or collection.user_id != user_id:
+            return None
+        return collection
 
     def update_collection(
         self,
@@ -200,7 +222,6 @@ class DocumentService:
             collection.description = description
 
         self.db.commit()
-        self.db.refresh(collection)
         return collection
 
     def delete_collection(self, collection_id: int, user_id: int) -> bool:
@@ -255,18 +276,13 @@ class DocumentService:
         )
         self.db.add(document)
         self.db.commit()
-        self.db.refresh(document)
 
         try:
             # Extract text based on content type
-            if content_type == "pdf":
-                text = extract_text_from_pdf(content)
-            elif content_type == "docx":
-                text = extract_text_from_docx(content)
-            elif content_type in ("txt", "csv"):
-                text = extract_text_from_txt(content)
-            else:
+            extract = TEXT_EXTRACTORS.get(content_type)
+            if extract is None:
                 raise ValueError(f"Unsupported content type: {content_type}")
+            text = extract(content)
 
             if not text.strip():
                 raise ValueError("No text could be extracted from the document")
@@ -292,14 +308,12 @@ class DocumentService:
 
             document.status = "ready"
             self.db.commit()
-            self.db.refresh(document)
 
         except Exception as e:
             logger.error(f"Failed to process document: {e}")
             document.status = "failed"
             document.error_message = str(e)
             self.db.commit()
-            self.db.refresh(document)
 
         return document
 
@@ -314,11 +328,10 @@ class DocumentService:
 
     def get_document(self, document_id: int, user_id: int) -> Document | None:
         """Get a single document by ID."""
-        return (
-            self.db.query(Document)
-            .filter(Document.id == document_id, Document.user_id == user_id)
-            .first()
-        )
+        document = self.db.get(Document, document_id)
+        if document is None or document.user_id != user_id:
+            return None
+        return document
 
     def delete_document(self, document_id: int, user_id: int) -> bool:
         """Delete a document and its chunks from ChromaDB."""
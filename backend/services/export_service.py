@@ -22,12 +22,8 @@ class ExportService:
         self, conversation_id: int, user_id: int
     ) -> tuple[Conversation, list[Message]] | None:
         """Get conversation and its messages if owned by user."""
-        conversation = (
-            self.db.query(Conversation)
-            .filter(Conversation.id == conversation_id, Conversation.user_id == user_id)
-            .first()
-        )
-        if not conversation:
+        conversation = self.db.get(Conversation, conversation_id)
+        if not conversation or conversation.user_id != user_id:
             return None
 
         messages = (
@@ -40,7 +36,7 @@ class ExportService:
 
     def _get_user_name(self, user_id: int) -> str:
         """Get user's display name."""
-        user = self.db.query(User).filter(User.id == user_id).first()
+        user = self.db.get(User, user_id)
         return user.display_name if user else "Unknown"
 
     def export_json(self, conversation_id: int, user_id: int) -> dict | None:
@@ -173,6 +169,7 @@ class ExportService:
 
         conversations = query.order_by(Conversation.created_at.desc()).all()
 
+        exported_at = datetime.now(timezone.utc).isoformat()
         zip_buffer = io.BytesIO()
         with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zf:
             for conv in conversations:
@@ -201,7 +198,7 @@ class ExportService:
                         }
                         for msg in messages
                     ],
-                    "exported_at": datetime.now(timezone.utc).isoformat(),
+                    "exported_at": exported_at,
                 }
 
                 # Filename: conversation-{id}-{sanitized_title}.json
@@ -40,6 +40,12 @@ COMMON_WORDS = {
     "yes", "no", "not", "only", "all", "any", "some", "every",
 }
 
+# Precompiled patterns used by extract_entities on every message
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_URL_RE = re.compile(r'https?://[^\s<>"\')\]]+(?<![.,;:!?])')
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+\s*')
+_NON_WORD_RE = re.compile(r'[^\w]')
+
 
 class GraphService:
     """
@@ -113,45 +119,44 @@ class GraphService:
         entities = []
         seen = set()  # Avoid duplicates
 
-        # Extract emails
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        for match in re.finditer(email_pattern, content):
-            email = match.group()
-            if email not in seen:
-                entities.append({"type": "email", "value": email})
-                seen.add(email)
-
-        # Extract URLs
-        url_pattern = r'https?://[^\s<>"\')\]]+(?<![.,;:!?])'
-        for match in re.finditer(url_pattern, content):
-            url = match.group()
-            if url not in seen:
-                entities.append({"type": "url", "value": url})
-                seen.add(url)
+        # Extract emails (skip the regex walk when there is no "@" at all)
+        if "@" in content:
+            for match in _EMAIL_RE.finditer(content):
+                email = match.group()
+                if email not in seen:
+                    entities.append({"type": "email", "value": email})
+                    seen.add(email)
+
+        # Extract URLs (same pre-scan for the scheme separator)
+        if "://" in content:
+            for match in _URL_RE.finditer(content):
+                url = match.group()
+                if url not in seen:
+                    entities.append({"type": "url", "value": url})
+                    seen.add(url)
 
         # Extract capitalized words/phrases (potential names, projects, etc.)
         # Split into sentences first to handle sentence-start capitalization
-        sentences = re.split(r'[.!?]+\s*', content)
+        sentences = _SENTENCE_SPLIT_RE.split(content)
 
         for sentence in sentences:
             if not sentence.strip():
                 continue
 
-            # Find capitalized words (not at the very start of sentence)
-            words = sentence.split()
+            # Find capitalized words (not at the very start of sentence).
+            # Strip punctuation once per word; the multi-word scan below
+            # revisits the same words.
+            words = [_NON_WORD_RE.sub('', w) for w in sentence.split()]
 
             # Find multi-word capitalized sequences
             i = 0
             while i < len(words):
-                word = words[i]
+                clean_word = words[i]
 
                 # Skip first word unless it's clearly a proper noun pattern
                 # (e.g., followed by another capitalized word)
                 is_first_word = (i == 0)
 
-                # Clean word of punctuation for checking
-                clean_word = re.sub(r'[^\w]', '', word)
-
                 if (
                     len(clean_word) >= 2
                     and clean_word[0].isupper()
@@ -162,8 +167,7 @@ class GraphService:
                     j = i + 1
 
                     while j < len(words):
-                        next_word = words[j]
-                        next_clean = re.sub(r'[^\w]', '', next_word)
+                        next_clean = words[j]
                         if (
                             len(next_clean) >= 2
                             and next_clean[0].isupper()
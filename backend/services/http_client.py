@@ -0,0 +1,36 @@
+"""Shared HTTP client for outbound calls from Nebulus Gantry.
+
+Creating an ``httpx.AsyncClient`` per request throws away its connection
+pool, so every LLM call paid a fresh TCP connect to TabbyAPI. A single
+process-wide client keeps keep-alive connections warm between requests.
+The client is created lazily and closed from the app lifespan.
+"""
+import httpx
+
+# Generous enough for concurrent streams from many sessions against one host
+HTTP_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=60.0,
+)
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared AsyncClient, creating it on first use.
+
+    Callers pass their own ``timeout`` per request.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(limits=HTTP_LIMITS)
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client (called on application shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
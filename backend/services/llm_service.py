@@ -1,13 +1,23 @@
-import json
+import asyncio
+
 import httpx
+import orjson
 from typing import AsyncGenerator
 
-from backend.config import Settings
+from backend.config import settings
+from backend.services.http_client import get_http_client
+
+# Per-request timeout for TabbyAPI calls (seconds)
+LLM_TIMEOUT = 60.0
+
+# Caps in-flight completions across all sessions so bursts queue here
+# instead of oversubscribing TabbyAPI and the shared connection pool.
+_llm_semaphore = asyncio.Semaphore(settings.llm_max_concurrency)
 
 
 class LLMService:
     def __init__(self):
-        self.settings = Settings()
+        self.settings = settings
         self.base_url = self.settings.tabby_host
         self.last_usage: dict | None = None
 
@@ -39,41 +49,43 @@ class LLMService:
         if temperature is not None:
             request_body["temperature"] = temperature
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            try:
-                async with client.stream(
-                    "POST",
-                    f"{self.base_url}/v1/chat/completions",
-                    json=request_body,
-                ) as response:
-                    response.raise_for_status()
-                    async for line in response.aiter_lines():
-                        if line.startswith("data: "):
-                            data = line[6:]
-                            if data == "[DONE]":
-                                break
-                            try:
-                                chunk = json.loads(data)
-                                # Capture usage if present (typically in last chunk)
-                                if "usage" in chunk and chunk["usage"]:
-                                    self.last_usage = chunk["usage"]
-                                if content := chunk.get("choices", [{}])[0].get("delta", {}).get("content"):
-                                    yield content
-                            except json.JSONDecodeError:
-                                continue
-            except httpx.HTTPStatusError as e:
-                yield f"[Error: LLM service returned {e.response.status_code}]"
-            except httpx.ConnectError:
-                yield "[Error: Could not connect to LLM service. Is TabbyAPI running?]"
-            except Exception as e:
-                yield f"[Error: {str(e)}]"
+        client = get_http_client()
+        try:
+            async with _llm_semaphore, client.stream(
+                "POST",
+                f"{self.base_url}/v1/chat/completions",
+                json=request_body,
+                timeout=LLM_TIMEOUT,
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if line.startswith("data: "):
+                        data = line[6:]
+                        if data == "[DONE]":
+                            break
+                        try:
+                            chunk = orjson.loads(data)
+                            # Capture usage if present (typically in last chunk)
+                            if "usage" in chunk and chunk["usage"]:
+                                self.last_usage = chunk["usage"]
+                            if content := chunk.get("choices", [{}])[0].get("delta", {}).get("content"):
+                                yield content
+                        except orjson.JSONDecodeError:
+                            continue
+        except httpx.HTTPStatusError as e:
+            yield f"[Error: LLM service returned {e.response.status_code}]"
+        except httpx.ConnectError:
+            yield "[Error: Could not connect to LLM service. Is TabbyAPI running?]"
+        except Exception as e:
+            yield f"[Error: {str(e)}]"
 
     async def chat(self, messages: list[dict], model: str = "default") -> str:
         """
         Non-streaming chat completion. Returns full response.
         """
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            try:
+        client = get_http_client()
+        try:
+            async with _llm_semaphore:
                 response = await client.post(
                     f"{self.base_url}/v1/chat/completions",
                     json={
@@ -81,9 +93,10 @@ class LLMService:
                         "messages": messages,
                         "stream": False,
                     },
+                    timeout=LLM_TIMEOUT,
                 )
-                response.raise_for_status()
-                data = response.json()
-                return data["choices"][0]["message"]["content"]
-            except Exception as e:
-                return f"[Error: {str(e)}]"
+            response.raise_for_status()
+            data = response.json()
+            return data["choices"][0]["message"]["content"]
+        except Exception as e:
+            return f"[Error: {str(e)}]"
@@ -9,15 +9,84 @@ Provides:
 Graceful degradation: If ChromaDB is unavailable, operations return
 empty results without crashing the application.
 """
+import asyncio
 import logging
-from typing import Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
 
 import chromadb
 
-from backend.config import Settings
+from backend.config import parse_chroma_host, settings
 
 logger = logging.getLogger(__name__)
 
+# Opening a ChromaDB HttpClient and resolving a collection each cost a
+# round-trip, and a MemoryService is created for every chat message. The
+# client and recently used collection handles are kept for the life of the
+# process instead; a handle is dropped when an operation on it fails.
+COLLECTION_HANDLES_MAX_SIZE = 512
+
+_clients: dict[tuple[str, int], Any] = {}
+_collections: "OrderedDict[tuple[str, int, int], Any]" = OrderedDict()
+_connections_lock = threading.Lock()
+
+
+def _get_collection(host: str, port: int, user_id: int) -> tuple[Any, Any]:
+    """Return the shared (client, collection) for a user, connecting on first use."""
+    key = (host, port, user_id)
+    with _connections_lock:
+        client = _clients.get((host, port))
+        collection = _collections.get(key)
+        if collection is not None:
+            _collections.move_to_end(key)
+            return client, collection
+
+    # Connecting is network I/O; do it unlocked so a slow or hung ChromaDB
+    # does not stall lookups for users whose handles are already cached.
+    if client is None:
+        client = chromadb.HttpClient(host=host, port=port)
+    collection = client.get_or_create_collection(name=f"user_{user_id}_messages")
+
+    with _connections_lock:
+        _clients.setdefault((host, port), client)
+        existing = _collections.get(key)
+        if existing is not None:
+            # Another thread resolved the same collection first
+            _collections.move_to_end(key)
+            return client, existing
+        _collections[key] = collection
+        if len(_collections) > COLLECTION_HANDLES_MAX_SIZE:
+            _collections.popitem(last=False)
+    logger.info(f"ChromaDB connected for user {user_id}")
+    return client, collection
+
+
+def reset_connections() -> None:
+    """Forget all shared ChromaDB clients and collection handles."""
+    with _connections_lock:
+        _clients.clear()
+        _collections.clear()
+    with _search_cache_lock:
+        _search_cache.clear()
+        _search_generations.clear()
+
+
+# A retried or regenerated chat message repeats the same memory query.
+# Results are reused for a short time, keyed by the user's collection and
+# the whitespace-normalized query; new embeddings for a user evict that
+# user's entries so fresh history is always visible.
+SEARCH_CACHE_TTL = 60.0
+SEARCH_CACHE_MAX_SIZE = 256
+
+# (host, port, user_id, query, limit) -> (cached until [monotonic], results)
+_search_cache: dict[tuple[str, int, int, str, int], tuple[float, list[dict]]] = {}
+# (host, port, user_id) -> eviction count. A search only stores its results
+# if no embed evicted the user while its query was in flight.
+_search_generations: dict[tuple[str, int, int], int] = {}
+_search_cache_lock = threading.Lock()
+
 
 class MemoryService:
     """
@@ -34,33 +103,15 @@ class MemoryService:
             user_id: The user ID for which to create/access the collection.
         """
         self.user_id = user_id
-        self.settings = Settings()
+        self.settings = settings
         self.collection = None
         self._available = False
 
         try:
-            # Parse host and port from chroma_host URL
-            host_url = self.settings.chroma_host
-            # Remove protocol if present
-            if host_url.startswith("http://"):
-                host_url = host_url[7:]
-            elif host_url.startswith("https://"):
-                host_url = host_url[8:]
-
-            # Split host and port
-            if ":" in host_url:
-                host, port_str = host_url.split(":", 1)
-                port = int(port_str)
-            else:
-                host = host_url
-                port = 8000
-
-            self.client = chromadb.HttpClient(host=host, port=port)
-            self.collection = self.client.get_or_create_collection(
-                name=f"user_{user_id}_messages"
-            )
+            host, port = parse_chroma_host(self.settings.chroma_host)
+            self._collection_key = (host, port, user_id)
+            self.client, self.collection = _get_collection(host, port, user_id)
             self._available = True
-            logger.info(f"ChromaDB connected for user {user_id}")
         except Exception as e:
             logger.warning(f"ChromaDB unavailable: {e}. Memory service will be disabled.")
             self.client = None
@@ -70,6 +121,19 @@ class MemoryService:
         """Check if the memory service is available."""
         return self._available
 
+    def _drop_collection(self) -> None:
+        """Forget this user's shared collection handle so the next use reconnects."""
+        with _connections_lock:
+            _collections.pop(self._collection_key, None)
+
+    def _clear_search_cache(self) -> None:
+        """Drop this user's cached search results."""
+        with _search_cache_lock:
+            _search_generations[self._collection_key] = _search_generations.get(self._collection_key, 0) + 1
+            stale = [key for key in _search_cache if key[:3] == self._collection_key]
+            for key in stale:
+                del _search_cache[key]
+
     async def embed_message(
         self,
         message_id: int,
@@ -87,19 +151,43 @@ class MemoryService:
         Returns:
             True if successful, None if unavailable or failed.
         """
-        if not self.available or self.collection is None:
+        return await self.embed_messages([(message_id, content, metadata)])
+
+    async def embed_messages(
+        self,
+        messages: list[tuple[int, str, Optional[dict]]]
+    ) -> Optional[bool]:
+        """
+        Embed several messages with a single ChromaDB add call.
+
+        Batching lets the embedding function encode all documents in one
+        pass and saves a round-trip per message.
+
+        Args:
+            messages: (message_id, content, metadata) tuples.
+
+        Returns:
+            True if successful, None if unavailable or failed.
+        """
+        if not self.available or self.collection is None or not messages:
             return None
 
+        message_ids = [message_id for message_id, _, _ in messages]
         try:
-            self.collection.add(
-                ids=[f"msg_{message_id}"],
-                documents=[content],
-                metadatas=[metadata or {}]
+            # chromadb's client is synchronous; keep its HTTP call and any
+            # embedding work off the event loop
+            await asyncio.to_thread(
+                self.collection.add,
+                ids=[f"msg_{message_id}" for message_id in message_ids],
+                documents=[content for _, content, _ in messages],
+                metadatas=[metadata or {} for _, _, metadata in messages]
             )
-            logger.debug(f"Embedded message {message_id} for user {self.user_id}")
+            logger.debug(f"Embedded messages {message_ids} for user {self.user_id}")
+            self._clear_search_cache()
             return True
         except Exception as e:
-            logger.error(f"Failed to embed message {message_id}: {e}")
+            logger.error(f"Failed to embed messages {message_ids}: {e}")
+            self._drop_collection()
             return None
 
     async def search_similar(self, query: str, limit: int = 5) -> list[dict]:
@@ -119,8 +207,17 @@ class MemoryService:
         if not self.available or self.collection is None:
             return []
 
+        cache_key = (*self._collection_key, " ".join(query.split()), limit)
+        now = time.monotonic()
+        with _search_cache_lock:
+            cached = _search_cache.get(cache_key)
+            generation = _search_generations.get(self._collection_key, 0)
+        if cached is not None and cached[0] > now:
+            return [dict(result) for result in cached[1]]
+
         try:
-            results = self.collection.query(
+            results = await asyncio.to_thread(
+                self.collection.query,
                 query_texts=[query],
                 n_results=limit
             )
@@ -139,7 +236,15 @@ class MemoryService:
                         "metadata": metadatas[i] if i < len(metadatas) else {}
                     })
 
-            return formatted_results
+            with _search_cache_lock:
+                # An embed that finished during the query may not be reflected
+                # in these results; return them but do not cache them.
+                if _search_generations.get(self._collection_key, 0) == generation:
+                    if cache_key not in _search_cache and len(_search_cache) >= SEARCH_CACHE_MAX_SIZE:
+                        _search_cache.pop(next(iter(_search_cache)))
+                    _search_cache[cache_key] = (now + SEARCH_CACHE_TTL, formatted_results)
+            return [dict(result) for result in formatted_results]
         except Exception as e:
             logger.error(f"Failed to search similar messages: {e}")
+            self._drop_collection()
             return []
@@ -5,17 +5,38 @@ and switching the active model. Gracefully degrades when TabbyAPI is
 unreachable (returns empty list / False).
 """
 
-import httpx
+import asyncio
 import logging
+import time
 
-from backend.config import Settings
+from backend.config import settings
+from backend.services.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
+# TabbyAPI's model directory changes rarely, so the model list (including
+# its active flag) is reused for this many seconds. Loading or unloading a
+# model through this service drops the cached list immediately.
+MODELS_CACHE_TTL = 30.0
+
+# The active model is looked up on every chat message. It is reused for a
+# shorter window so a switch made outside Gantry is still picked up quickly.
+ACTIVE_MODEL_CACHE_TTL = 5.0
+
+_models_cache: tuple[float, list[dict]] | None = None
+_active_model_cache: tuple[float, dict | None] | None = None
+
+
+def invalidate_models_cache() -> None:
+    """Drop the cached model list and active model so both are refetched."""
+    global _models_cache, _active_model_cache
+    _models_cache = None
+    _active_model_cache = None
+
 
 class ModelService:
     def __init__(self):
-        self.settings = Settings()
+        self.settings = settings
         self.base_url = self.settings.tabby_host
 
     async def get_active_model(self) -> dict | None:
@@ -23,16 +44,24 @@ class ModelService:
 
         Uses the TabbyAPI-specific /v1/model endpoint.
         Returns a dict with 'id' and 'name', or None if unavailable.
+        Answers (including "no model loaded") are cached for
+        ACTIVE_MODEL_CACHE_TTL seconds; failures are not.
         """
+        global _active_model_cache
+        now = time.monotonic()
+        if _active_model_cache is not None and _active_model_cache[0] > now:
+            cached = _active_model_cache[1]
+            return dict(cached) if cached else None
+
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(f"{self.base_url}/v1/model")
-                response.raise_for_status()
-                data = response.json()
-                model_id = data.get("id", "")
-                if model_id:
-                    return {"id": model_id, "name": model_id}
-                return None
+            client = get_http_client()
+            response = await client.get(f"{self.base_url}/v1/model", timeout=10.0)
+            response.raise_for_status()
+            data = response.json()
+            model_id = data.get("id", "")
+            active = {"id": model_id, "name": model_id} if model_id else None
+            _active_model_cache = (now + ACTIVE_MODEL_CACHE_TTL, active)
+            return dict(active) if active else None
         except Exception as e:
             logger.warning(f"Failed to get active model: {e}")
             return None
@@ -43,29 +72,42 @@ class ModelService:
         Returns a list of dicts with keys: id, name, active.
         Cross-references with the active model endpoint to mark
         which model is currently loaded.
-        Returns an empty list if TabbyAPI is unreachable.
+        Returns an empty list if TabbyAPI is unreachable. Successful results
+        are cached for MODELS_CACHE_TTL seconds.
         """
+        global _models_cache
+        now = time.monotonic()
+        if _models_cache is not None and _models_cache[0] > now:
+            return [dict(m) for m in _models_cache[1]]
+
         try:
-            active_model = await self.get_active_model()
+            # Both TabbyAPI lookups are independent; run them concurrently
+            active_model, data = await asyncio.gather(
+                self.get_active_model(),
+                self._fetch_model_list(),
+            )
             active_id = active_model["id"] if active_model else None
-
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(f"{self.base_url}/v1/models")
-                response.raise_for_status()
-                data = response.json()
-                models = []
-                for model in data.get("data", []):
-                    model_id = model["id"]
-                    models.append({
-                        "id": model_id,
-                        "name": model.get("id", "unknown"),
-                        "active": model.get("active", model_id == active_id),
-                    })
-                return models
+            models = [
+                {
+                    "id": model["id"],
+                    "name": model.get("id", "unknown"),
+                    "active": model.get("active", model["id"] == active_id),
+                }
+                for model in data.get("data", [])
+            ]
+            _models_cache = (now + MODELS_CACHE_TTL, models)
+            return [dict(m) for m in models]
         except Exception as e:
             logger.warning(f"Failed to list models: {e}")
             return []
 
+    async def _fetch_model_list(self) -> dict:
+        """GET TabbyAPI's /v1/models payload (raises on failure)."""
+        client = get_http_client()
+        response = await client.get(f"{self.base_url}/v1/models", timeout=10.0)
+        response.raise_for_status()
+        return response.json()
+
     async def switch_model(self, model_id: str) -> bool:
         """Switch the active model in TabbyAPI.
 
@@ -73,16 +115,20 @@ class ModelService:
         Returns True on success, False on failure.
         """
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/v1/model/load",
-                    json={"model_name": model_id},
-                )
-                response.raise_for_status()
-                return True
+            client = get_http_client()
+            response = await client.post(
+                f"{self.base_url}/v1/model/load",
+                json={"model_name": model_id},
+                timeout=30.0,
+            )
+            response.raise_for_status()
+            return True
         except Exception as e:
             logger.warning(f"Failed to switch model: {e}")
             return False
+        finally:
+            # Even a failed load may have unloaded the previous model
+            invalidate_models_cache()
 
     async def unload_model(self) -> bool:
         """Unload the current model from TabbyAPI.
@@ -90,12 +136,15 @@ class ModelService:
         Returns True on success, False on failure.
         """
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/v1/model/unload",
-                )
-                response.raise_for_status()
-                return True
+            client = get_http_client()
+            response = await client.post(
+                f"{self.base_url}/v1/model/unload",
+                timeout=30.0,
+            )
+            response.raise_for_status()
+            return True
         except Exception as e:
             logger.warning(f"Failed to unload model: {e}")
             return False
+        finally:
+            invalidate_models_cache()
@@ -55,7 +55,6 @@ class PersonaService:
         )
         self.db.add(persona)
         self.db.commit()
-        self.db.refresh(persona)
         return persona
 
     def list_personas(self, user_id: int) -> list[Persona]:
@@ -97,7 +96,7 @@ class PersonaService:
 
     def get_persona_by_id(self, persona_id: int) -> Persona | None:
         """Get a persona by ID without access control (for internal use)."""
-        return self.db.query(Persona).filter(Persona.id == persona_id).first()
+        return self.db.get(Persona, persona_id)
 
     def update_persona(
         self,
@@ -133,7 +132,6 @@ class PersonaService:
             persona.model_id = model_id
 
         self.db.commit()
-        self.db.refresh(persona)
         return persona
 
     def update_system_persona(
@@ -172,7 +170,6 @@ class PersonaService:
             persona.is_default = is_default
 
         self.db.commit()
-        self.db.refresh(persona)
         return persona
 
     def delete_persona(self, persona_id: int, user_id: int) -> bool:
@@ -242,5 +239,4 @@ class PersonaService:
 
         conversation.persona_id = persona_id
         self.db.commit()
-        self.db.refresh(conversation)
         return conversation
@@ -1,10 +1,180 @@
 """
 Pytest configuration and shared fixtures for backend tests.
 """
+import contextlib
+import functools
+import itertools
 import os
 
 # Ensure module-level code in dependencies.py uses an in-memory database
 # instead of creating a file-based SQLite database.
 os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
 
-import pytest  # noqa: F401, E402
+import pytest  # noqa: E402
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+import backend.models  # noqa: E402, F401  (registers every table on Base)
+from backend.database import Base  # noqa: E402
+
+
+# ── Password hashing ─────────────────────────────────────────────────────────
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _cache_password_hashing():
+    """Run bcrypt once per distinct input instead of once per call.
+
+    bcrypt is deliberately slow and nearly every fixture creates a user.
+    gensalt is pinned to one salt generated up front, so hashpw sees
+    repeated (password, salt) pairs and the real hashpw/checkpw results
+    can be memoized on their full arguments. Patched on the bcrypt module
+    because the routers import hash_password/verify_password by name.
+    """
+    import bcrypt
+
+    salt = bcrypt.gensalt()
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(bcrypt, "gensalt", lambda *args, **kwargs: salt)
+        mp.setattr(bcrypt, "hashpw", functools.lru_cache(maxsize=64)(bcrypt.hashpw))
+        mp.setattr(bcrypt, "checkpw", functools.lru_cache(maxsize=256)(bcrypt.checkpw))
+        yield
+
+
+# ── Session tokens ───────────────────────────────────────────────────────────
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _deterministic_session_tokens():
+    """Hand out sequential session tokens so failures are easy to reproduce.
+
+    Tokens stay unique for the whole run, which the shared database and the
+    session cache rely on.
+    """
+    counter = itertools.count(1)
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(
+            "backend.services.auth_service._new_session_token",
+            lambda: f"test-token-{next(counter):032x}",
+        )
+        yield
+
+
+# ── Graph storage ────────────────────────────────────────────────────────────
+
+
+@pytest.fixture(autouse=True)
+def _graph_data_in_tmp(monkeypatch, tmp_path):
+    """Keep GraphService's per-user JSON files out of the repo's data/ directory.
+
+    Route tests that don't mock the graph factory still persist the
+    entities they extract.
+    """
+    try:
+        from backend.services import graph_service
+    except ImportError:  # networkx missing; the chat route skips the graph
+        return
+    monkeypatch.setattr(graph_service, "DATA_DIR", str(tmp_path / "data"))
+
+
+# ── Shared test database ─────────────────────────────────────────────────────
+
+
+@pytest.fixture(scope="session")
+def db_engine():
+    """One in-memory database with the full schema for the whole run."""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    # pysqlite issues its own BEGIN lazily and does not nest SAVEPOINTs
+    # correctly; hand transaction control to SQLAlchemy instead.
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    # The database is brand new, so skip the per-table existence checks
+    Base.metadata.create_all(bind=engine, checkfirst=False)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_sessionmaker(db_engine):
+    """Session factory whose work is rolled back when the test ends.
+
+    Sessions join an outer transaction on a single connection; their
+    commits only release SAVEPOINTs, so nothing outlives the test.
+    """
+    connection = db_engine.connect()
+    transaction = connection.begin()
+    TestSessionLocal = sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=connection,
+        join_transaction_mode="create_savepoint",
+    )
+    yield TestSessionLocal
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture
+def app_db(db_sessionmaker):
+    """Route the app's get_db dependency to the shared test database.
+
+    Route test modules opt in with
+    ``pytestmark = pytest.mark.usefixtures("app_db")``; the fixture
+    returns the session factory so tests can seed and inspect the same
+    rolled-back transaction the requests see.
+    """
+    from backend.dependencies import get_db
+    from backend.main import app
+
+    def override_get_db():
+        db = db_sessionmaker()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield db_sessionmaker
+    app.dependency_overrides.pop(get_db, None)
+
+
+# ── Statement counting ───────────────────────────────────────────────────────
+
+
+@pytest.fixture
+def count_statements():
+    """Record the SQL a block sends through an engine or connection.
+
+    Use as ``with count_statements(bind) as statements:``. The SAVEPOINTs
+    the shared test database opens for each new session are left out, so
+    the list only holds what the code under test executed.
+    """
+    @contextlib.contextmanager
+    def _count(bind):
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            if not statement.startswith("SAVEPOINT"):
+                statements.append(statement)
+
+        event.listen(bind, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(bind, "before_cursor_execute", record)
+
+    return _count
@@ -2,18 +2,13 @@
 import os
 from unittest.mock import patch
 
-# Set test database URL before any backend imports to avoid the module-level
-# create_all in dependencies.py trying to open the default sqlite file.
+# Point the engine dependencies.py builds at import time at an in-memory
+# database instead of the default sqlite file.
 os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
 
 import pytest  # noqa: E402
 from fastapi.testclient import TestClient  # noqa: E402
-from sqlalchemy import create_engine  # noqa: E402
-from sqlalchemy.orm import sessionmaker  # noqa: E402
-from sqlalchemy.pool import StaticPool  # noqa: E402
 
-from backend.database import Base  # noqa: E402
-from backend.dependencies import get_db  # noqa: E402
 from backend.main import app  # noqa: E402
 from backend.models.user import User  # noqa: E402, F401
 from backend.models.session import Session  # noqa: E402, F401
@@ -23,35 +18,13 @@ from backend.services.auth_service import AuthService  # noqa: E402
 # ── Test database setup ──────────────────────────────────────────────────────
 
 
-@pytest.fixture(autouse=True)
-def setup_db():
-    """Create an isolated in-memory database for each test."""
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    Base.metadata.create_all(bind=engine)
-
-    def override_get_db():
-        db = TestSessionLocal()
-        try:
-            yield db
-        finally:
-            db.close()
-
-    app.dependency_overrides[get_db] = override_get_db
-    yield TestSessionLocal
-    app.dependency_overrides.pop(get_db, None)
-    Base.metadata.drop_all(bind=engine)
-    engine.dispose()
+pytestmark = pytest.mark.usefixtures("app_db")
 
 
 @pytest.fixture
-def db(setup_db):
+def db(app_db):
     """Provide a test database session."""
-    session = setup_db()
+    session = app_db()
     try:
         yield session
     finally:
@@ -638,6 +611,52 @@ class TestModelRoutes:
         assert "models" in data
         assert isinstance(data["models"], list)
 
+    def test_list_models_etag(self, client, regular_user):
+        """A matching If-None-Match gets a bodiless 304."""
+        from unittest.mock import AsyncMock
+
+        _, token = regular_user
+        models = [{"id": "llama-3-8b", "name": "llama-3-8b", "active": True}]
+        with patch(
+            "backend.routers.models._model_service.list_models",
+            new_callable=AsyncMock,
+            return_value=models,
+        ):
+            first = client.get("/api/models", cookies={"session_token": token})
+            etag = first.headers["etag"]
+            second = client.get(
+                "/api/models",
+                cookies={"session_token": token},
+                headers={"If-None-Match": etag},
+            )
+
+        assert first.status_code == 200
+        assert first.json() == {"models": models}
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == etag
+
+    def test_list_models_etag_changes_with_content(self, client, regular_user):
+        """A stale ETag gets the full, updated list."""
+        from unittest.mock import AsyncMock
+
+        _, token = regular_user
+        with patch(
+            "backend.routers.models._model_service.list_models",
+            new_callable=AsyncMock,
+            side_effect=[[], [{"id": "mistral-7b", "name": "mistral-7b", "active": False}]],
+        ):
+            first = client.get("/api/models", cookies={"session_token": token})
+            second = client.get(
+                "/api/models",
+                cookies={"session_token": token},
+                headers={"If-None-Match": first.headers["etag"]},
+            )
+
+        assert second.status_code == 200
+        assert second.headers["etag"] != first.headers["etag"]
+        assert second.json()["models"][0]["id"] == "mistral-7b"
+
     def test_get_active_model_unauthenticated(self, client):
         """GET /api/models/active should require authentication."""
         response = client.get("/api/models/active")
@@ -1,18 +1,14 @@
 """Tests for auth routes (login, logout, /me)."""
 import os
 
-# Set test database URL before any backend imports to avoid the module-level
-# create_all in dependencies.py trying to open the default sqlite file.
+# Point the engine dependencies.py builds at import time at an in-memory
+# database instead of the default sqlite file.
 os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
 
 import pytest  # noqa: E402
-from fastapi.testclient import TestClient  # noqa: E402
-from sqlalchemy import create_engine  # noqa: E402
-from sqlalchemy.orm import sessionmaker  # noqa: E402
-from sqlalchemy.pool import StaticPool  # noqa: E402
+import httpx  # noqa: E402
+import pytest_asyncio  # noqa: E402
 
-from backend.database import Base  # noqa: E402
-from backend.dependencies import get_db  # noqa: E402
 from backend.main import app  # noqa: E402
 from backend.models.user import User  # noqa: E402, F401
 from backend.models.session import Session  # noqa: E402, F401
@@ -22,45 +18,35 @@ from backend.services.auth_service import AuthService  # noqa: E402
 # ── Test database setup ──────────────────────────────────────────────────────
 
 
-@pytest.fixture(autouse=True)
-def setup_db():
-    """Create an isolated in-memory database for each test."""
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    Base.metadata.create_all(bind=engine)
-
-    def override_get_db():
-        db = TestSessionLocal()
-        try:
-            yield db
-        finally:
-            db.close()
-
-    app.dependency_overrides[get_db] = override_get_db
-    yield TestSessionLocal
-    app.dependency_overrides.pop(get_db, None)
-    Base.metadata.drop_all(bind=engine)
-    engine.dispose()
+pytestmark = [
+    pytest.mark.usefixtures("app_db"),
+    pytest.mark.asyncio(loop_scope="module"),
+]
 
 
 @pytest.fixture
-def db(setup_db):
+def db(app_db):
     """Provide a test database session."""
-    session = setup_db()
+    session = app_db()
     try:
         yield session
     finally:
         session.close()
 
 
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def shared_client():
+    """One in-process async client for the module, on the module's event loop."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+
+
 @pytest.fixture
-def client():
-    """Provide a FastAPI test client."""
-    return TestClient(app)
+def client(shared_client):
+    """Provide the async client with an empty cookie jar."""
+    shared_client.cookies.clear()
+    return shared_client
 
 
 @pytest.fixture
@@ -83,9 +69,9 @@ def test_user(db):
 class TestLogin:
     """Test POST /api/auth/login."""
 
-    def test_login_success(self, client, test_user):
+    async def test_login_success(self, client, test_user):
         """POST /api/auth/login with correct credentials returns 200 and sets cookie."""
-        response = client.post(
+        response = await client.post(
             "/api/auth/login",
             json={"email": "user@test.com", "password": "correctpass"},
         )
@@ -93,26 +79,26 @@ class TestLogin:
         assert response.json()["message"] == "Login successful"
         assert "session_token" in response.cookies
 
-    def test_login_wrong_password(self, client, test_user):
+    async def test_login_wrong_password(self, client, test_user):
         """POST /api/auth/login with wrong password returns 401."""
-        response = client.post(
+        response = await client.post(
             "/api/auth/login",
             json={"email": "user@test.com", "password": "wrongpass"},
         )
         assert response.status_code == 401
         assert response.json()["detail"] == "Invalid credentials"
 
-    def test_login_unknown_email(self, client):
+    async def test_login_unknown_email(self, client):
         """POST /api/auth/login with unknown email returns 401."""
-        response = client.post(
+        response = await client.post(
             "/api/auth/login",
             json={"email": "nobody@test.com", "password": "whatever"},
         )
         assert response.status_code == 401
 
-    def test_login_missing_fields(self, client):
+    async def test_login_missing_fields(self, client):
         """POST /api/auth/login with empty JSON body returns 422."""
-        response = client.post("/api/auth/login", json={})
+        response = await client.post("/api/auth/login", json={})
         assert response.status_code == 422
 
 
@@ -122,19 +108,19 @@ class TestLogin:
 class TestLogout:
     """Test POST /api/auth/logout."""
 
-    def test_logout_clears_cookie(self, client, test_user):
+    async def test_logout_clears_cookie(self, client, test_user):
         """POST /api/auth/logout with session cookie returns 200."""
         _, token = test_user
-        response = client.post(
+        response = await client.post(
             "/api/auth/logout",
             cookies={"session_token": token},
         )
         assert response.status_code == 200
         assert response.json()["message"] == "Logout successful"
 
-    def test_logout_without_cookie(self, client):
+    async def test_logout_without_cookie(self, client):
         """POST /api/auth/logout without a session cookie still returns 200."""
-        response = client.post("/api/auth/logout")
+        response = await client.post("/api/auth/logout")
         assert response.status_code == 200
         assert response.json()["message"] == "Logout successful"
 
@@ -145,10 +131,10 @@ class TestLogout:
 class TestGetMe:
     """Test GET /api/auth/me."""
 
-    def test_me_returns_user(self, client, test_user):
+    async def test_me_returns_user(self, client, test_user):
         """GET /api/auth/me with valid cookie returns user data without password_hash."""
         user_obj, token = test_user
-        response = client.get(
+        response = await client.get(
             "/api/auth/me",
             cookies={"session_token": token},
         )
@@ -160,14 +146,14 @@ class TestGetMe:
         assert "password_hash" not in data
         assert "password" not in data
 
-    def test_me_unauthenticated(self, client):
+    async def test_me_unauthenticated(self, client):
         """GET /api/auth/me without a cookie returns 401."""
-        response = client.get("/api/auth/me")
+        response = await client.get("/api/auth/me")
         assert response.status_code == 401
 
-    def test_me_invalid_token(self, client):
+    async def test_me_invalid_token(self, client):
         """GET /api/auth/me with an invalid token cookie returns 401."""
-        response = client.get(
+        response = await client.get(
             "/api/auth/me",
             cookies={"session_token": "invalid-token-value"},
         )
@@ -180,10 +166,10 @@ class TestGetMe:
 class TestChangePassword:
     """Test POST /api/auth/change-password."""
 
-    def test_change_password_success(self, client, test_user):
+    async def test_change_password_success(self, client, test_user):
         """Change password with correct current password succeeds."""
         _, token = test_user
-        response = client.post(
+        response = await client.post(
             "/api/auth/change-password",
             json={"current_password": "correctpass", "new_password": "newpass123"},
             cookies={"session_token": token},
@@ -191,16 +177,16 @@ class TestChangePassword:
         assert response.status_code == 200
         assert "successfully" in response.json()["message"].lower()
         # Verify login works with new password
-        login_resp = client.post(
+        login_resp = await client.post(
             "/api/auth/login",
             json={"email": "user@test.com", "password": "newpass123"},
         )
         assert login_resp.status_code == 200
 
-    def test_change_password_wrong_current(self, client, test_user):
+    async def test_change_password_wrong_current(self, client, test_user):
         """Change password with wrong current password returns 400."""
         _, token = test_user
-        response = client.post(
+        response = await client.post(
             "/api/auth/change-password",
             json={"current_password": "wrongpass", "new_password": "newpass123"},
             cookies={"session_token": token},
@@ -208,9 +194,9 @@ class TestChangePassword:
         assert response.status_code == 400
         assert "incorrect" in response.json()["detail"].lower()
 
-    def test_change_password_unauthenticated(self, client):
+    async def test_change_password_unauthenticated(self, client):
         """Change password without a session cookie returns 401."""
-        response = client.post(
+        response = await client.post(
             "/api/auth/change-password",
             json={"current_password": "old", "new_password": "new"},
         )
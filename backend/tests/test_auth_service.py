@@ -2,21 +2,20 @@
 import os
 from datetime import datetime, timedelta, timezone
 
-# Set test database URL before any backend imports to avoid the module-level
-# create_all in dependencies.py trying to open the default sqlite file.
+# Point the engine dependencies.py builds at import time at an in-memory
+# database instead of the default sqlite file.
 os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
 
 import pytest  # noqa: E402
-from sqlalchemy import create_engine  # noqa: E402
-from sqlalchemy.orm import sessionmaker  # noqa: E402
-from sqlalchemy.pool import StaticPool  # noqa: E402
 
-from backend.database import Base  # noqa: E402
 from backend.models.user import User  # noqa: E402, F401
 from backend.models.session import Session  # noqa: E402, F401
 from backend.services.auth_service import (  # noqa: E402
     AuthService,
+    CurrentUser,
+    forget_failed_logins,
     hash_password,
+    invalidate_session_cache,
     verify_password,
 )
 
@@ -25,18 +24,13 @@ from backend.services.auth_service import (  # noqa: E402
 
 
 @pytest.fixture(autouse=True)
-def setup_db():
-    """Create an isolated in-memory database for each test."""
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    Base.metadata.create_all(bind=engine)
-    yield TestSessionLocal
-    Base.metadata.drop_all(bind=engine)
-    engine.dispose()
+def setup_db(db_sessionmaker):
+    """Use the shared test database with empty auth caches."""
+    invalidate_session_cache()
+    forget_failed_logins()
+    yield db_sessionmaker
+    invalidate_session_cache()
+    forget_failed_logins()
 
 
 @pytest.fixture
@@ -124,34 +118,63 @@ class TestCreateUser:
 class TestAuthenticate:
     """Test AuthService.authenticate."""
 
-    def test_authenticate_success(self, db):
-        """Correct email + password returns the User."""
+    @pytest.mark.parametrize("email, password, expected", [
+        ("carol@example.com", "carolpass", "carol@example.com"),
+        ("carol@example.com", "wrongpass", None),
+        ("nobody@example.com", "carolpass", None),
+    ], ids=["success", "wrong-password", "unknown-email"])
+    def test_authenticate(self, db, email, password, expected):
+        """Only a matching email + password returns the User; anything else is None."""
         auth = AuthService(db)
         auth.create_user(
             email="carol@example.com",
             password="carolpass",
             display_name="Carol",
         )
-        result = auth.authenticate("carol@example.com", "carolpass")
-        assert isinstance(result, User)
-        assert result.email == "carol@example.com"
+        result = auth.authenticate(email, password)
+        if expected is None:
+            assert result is None
+        else:
+            assert isinstance(result, User)
+            assert result.email == expected
 
-    def test_authenticate_wrong_password(self, db):
-        """Wrong password returns None."""
-        auth = AuthService(db)
-        auth.create_user(
-            email="dave@example.com",
-            password="davepass",
-            display_name="Dave",
-        )
-        result = auth.authenticate("dave@example.com", "wrongpass")
-        assert result is None
+    def test_repeated_failure_skips_hash_check(self, db):
+        """Retrying the same bad credentials is rejected without re-hashing."""
+        from unittest.mock import patch
 
-    def test_authenticate_unknown_email(self, db):
-        """Non-existent email returns None."""
         auth = AuthService(db)
-        result = auth.authenticate("nobody@example.com", "anypass")
-        assert result is None
+        auth.create_user(email="gus@example.com", password="guspass", display_name="Gus")
+        with patch("backend.services.auth_service.verify_password", return_value=False) as mock_verify:
+            assert auth.authenticate("gus@example.com", "wrongpass") is None
+            assert auth.authenticate("gus@example.com", "wrongpass") is None
+        mock_verify.assert_called_once()
+
+    def test_failure_does_not_block_correct_password(self, db):
+        """A remembered failure only applies to that exact password."""
+        auth = AuthService(db)
+        auth.create_user(email="hal@example.com", password="halpass", display_name="Hal")
+        assert auth.authenticate("hal@example.com", "wrongpass") is None
+        assert auth.authenticate("hal@example.com", "halpass") is not None
+
+    def test_failed_password_digest_is_keyed(self):
+        """Remembered attempts are HMACed, not plain SHA-256 of the password."""
+        import hashlib
+        from backend.services.auth_service import _failed_login_key
+
+        email, digest = _failed_login_key("ivy@example.com", "hunter2")
+        assert email == "ivy@example.com"
+        assert digest == _failed_login_key("ivy@example.com", "hunter2")[1]
+        assert digest != hashlib.sha256(b"hunter2").digest()
+
+    def test_forget_after_password_change(self, db):
+        """Forgetting an email's failures lets a newly set password work at once."""
+        auth = AuthService(db)
+        user = auth.create_user(email="ida@example.com", password="idapass", display_name="Ida")
+        assert auth.authenticate("ida@example.com", "newpass") is None
+        user.password_hash = hash_password("newpass")
+        db.commit()
+        forget_failed_logins("ida@example.com")
+        assert auth.authenticate("ida@example.com", "newpass") is not None
 
 
 # ── Session tests ─────────────────────────────────────────────────────────────
@@ -185,6 +208,20 @@ class TestSessions:
         assert isinstance(result, User)
         assert result.id == user.id
 
+    def test_validate_session_single_query(self, db, setup_db, count_statements):
+        """validate_session loads the session and its user in one SELECT."""
+        auth, user = self._make_user(db)
+        token = auth.create_session(user.id)
+
+        fresh = setup_db()
+        try:
+            with count_statements(fresh.get_bind()) as statements:
+                result = AuthService(fresh).validate_session(token)
+            assert result.email == "eve@example.com"
+        finally:
+            fresh.close()
+        assert len(statements) == 1
+
     def test_validate_session_invalid_token(self, db):
         """validate_session with a nonexistent token returns None."""
         auth, _ = self._make_user(db)
@@ -213,3 +250,60 @@ class TestSessions:
         """delete_session with a nonexistent token returns False."""
         auth, _ = self._make_user(db)
         assert auth.delete_session("does-not-exist") is False
+
+
+# ── Session cache tests ──────────────────────────────────────────────────────
+
+
+class TestSessionCache:
+    """Test the per-token cache behind get_session_user."""
+
+    def _login(self, db) -> tuple[AuthService, User, str]:
+        auth = AuthService(db)
+        user = auth.create_user(email="fay@example.com", password="faypass", display_name="Fay")
+        return auth, user, auth.create_session(user.id)
+
+    def test_returns_detached_snapshot(self, db):
+        """get_session_user returns a CurrentUser with the user's columns."""
+        auth, user, token = self._login(db)
+        current = auth.get_session_user(token)
+        assert current == CurrentUser(id=user.id, email="fay@example.com", display_name="Fay", role="user")
+
+    def test_cache_hit_skips_database(self, db, count_statements):
+        """A second lookup for the same token issues no queries."""
+        auth, user, token = self._login(db)
+        auth.get_session_user(token)
+        with count_statements(db.get_bind()) as statements:
+            current = auth.get_session_user(token)
+        assert current.id == user.id
+        assert statements == []
+
+    def test_delete_session_evicts_token(self, db):
+        """Logging out makes the cached token invalid immediately."""
+        auth, _, token = self._login(db)
+        assert auth.get_session_user(token) is not None
+        auth.delete_session(token)
+        assert auth.get_session_user(token) is None
+
+    def test_invalidate_by_user_id(self, db):
+        """Evicting by user id forces a fresh lookup that sees changes."""
+        auth, user, token = self._login(db)
+        auth.get_session_user(token)
+        user.role = "admin"
+        db.commit()
+        assert auth.get_session_user(token).role == "user"
+        invalidate_session_cache(user_id=user.id)
+        assert auth.get_session_user(token).role == "admin"
+
+    def test_cached_session_still_expires(self, db):
+        """A cached entry is not served past the session's expiry."""
+        from backend.services import auth_service
+
+        auth, _, token = self._login(db)
+        auth.get_session_user(token)
+        session_obj = db.query(Session).filter(Session.token == token).first()
+        session_obj.expires_at = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=1)
+        db.commit()
+        cached_until, _, user = auth_service._session_cache[token]
+        auth_service._session_cache[token] = (cached_until, session_obj.expires_at, user)
+        assert auth.get_session_user(token) is None
@@ -2,18 +2,14 @@
 import os
 from unittest.mock import patch, AsyncMock, MagicMock
 
-# Set test database URL before any backend imports to avoid the module-level
-# create_all in dependencies.py trying to open the default sqlite file.
+# Point the engine dependencies.py builds at import time at an in-memory
+# database instead of the default sqlite file.
 os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
 
 import pytest  # noqa: E402
-from fastapi.testclient import TestClient  # noqa: E402
-from sqlalchemy import create_engine  # noqa: E402
-from sqlalchemy.orm import sessionmaker  # noqa: E402
-from sqlalchemy.pool import StaticPool  # noqa: E402
+import httpx  # noqa: E402
+import pytest_asyncio  # noqa: E402
 
-from backend.database import Base  # noqa: E402
-from backend.dependencies import get_db  # noqa: E402
 from backend.main import app  # noqa: E402
 from backend.models.user import User  # noqa: E402, F401
 from backend.models.session import Session  # noqa: E402, F401
@@ -26,45 +22,35 @@ from backend.services.chat_service import ChatService  # noqa: E402
 # ── Test database setup ──────────────────────────────────────────────────────
 
 
-@pytest.fixture(autouse=True)
-def setup_db():
-    """Create an isolated in-memory database for each test."""
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    Base.metadata.create_all(bind=engine)
-
-    def override_get_db():
-        db = TestSessionLocal()
-        try:
-            yield db
-        finally:
-            db.close()
-
-    app.dependency_overrides[get_db] = override_get_db
-    yield TestSessionLocal
-    app.dependency_overrides.pop(get_db, None)
-    Base.metadata.drop_all(bind=engine)
-    engine.dispose()
+pytestmark = [
+    pytest.mark.usefixtures("app_db"),
+    pytest.mark.asyncio(loop_scope="module"),
+]
 
 
 @pytest.fixture
-def db(setup_db):
+def db(app_db):
     """Provide a test database session."""
-    session = setup_db()
+    session = app_db()
     try:
         yield session
     finally:
         session.close()
 
 
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def shared_client():
+    """One in-process async client for the module, on the module's event loop."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+
+
 @pytest.fixture
-def client():
-    """Provide a FastAPI test client."""
-    return TestClient(app)
+def client(shared_client):
+    """Provide the async client with an empty cookie jar."""
+    shared_client.cookies.clear()
+    return shared_client
 
 
 @pytest.fixture
@@ -81,16 +67,27 @@ def test_user(db):
     return user, token
 
 
+@pytest.fixture
+def conv_id(db, test_user):
+    """Create a conversation for test_user directly and return its id.
+
+    Only TestCreateConversation needs to exercise the POST route; the
+    other tests just need a conversation to exist.
+    """
+    user, _ = test_user
+    return ChatService(db).create_conversation(user.id).id
+
+
 # ── Create Conversation tests ────────────────────────────────────────────────
 
 
 class TestCreateConversation:
     """Test POST /api/chat/conversations."""
 
-    def test_create_conversation(self, client, test_user):
+    async def test_create_conversation(self, client, test_user):
         """POST /api/chat/conversations returns 200 with title and id."""
         _, token = test_user
-        response = client.post(
+        response = await client.post(
             "/api/chat/conversations",
             cookies={"session_token": token},
         )
@@ -99,9 +96,9 @@ class TestCreateConversation:
         assert "id" in data
         assert data["title"] == "New Thread"
 
-    def test_create_conversation_unauthenticated(self, client):
+    async def test_create_conversation_unauthenticated(self, client):
         """POST /api/chat/conversations without cookie returns 401."""
-        response = client.post("/api/chat/conversations")
+        response = await client.post("/api/chat/conversations")
         assert response.status_code == 401
 
 
@@ -111,13 +108,13 @@ class TestCreateConversation:
 class TestListConversations:
     """Test GET /api/chat/conversations."""
 
-    def test_list_conversations(self, client, test_user):
+    async def test_list_conversations(self, client, test_user):
         """Create 2 conversations, GET returns list of 2."""
         _, token = test_user
-        client.post("/api/chat/conversations", cookies={"session_token": token})
-        client.post("/api/chat/conversations", cookies={"session_token": token})
+        await client.post("/api/chat/conversations", cookies={"session_token": token})
+        await client.post("/api/chat/conversations", cookies={"session_token": token})
 
-        response = client.get(
+        response = await client.get(
             "/api/chat/conversations",
             cookies={"session_token": token},
         )
@@ -126,10 +123,10 @@ class TestListConversations:
         assert isinstance(data, list)
         assert len(data) == 2
 
-    def test_list_conversations_empty(self, client, test_user):
+    async def test_list_conversations_empty(self, client, test_user):
         """GET with no conversations returns empty list."""
         _, token = test_user
-        response = client.get(
+        response = await client.get(
             "/api/chat/conversations",
             cookies={"session_token": token},
         )
@@ -137,6 +134,25 @@ class TestListConversations:
         data = response.json()
         assert data == []
 
+    async def test_list_conversations_limit(self, client, test_user):
+        """?limit= returns only the first N conversations in list order."""
+        _, token = test_user
+        for _ in range(3):
+            await client.post("/api/chat/conversations", cookies={"session_token": token})
+
+        response = await client.get(
+            "/api/chat/conversations?limit=2",
+            cookies={"session_token": token},
+        )
+        assert response.status_code == 200
+        assert len(response.json()) == 2
+
+        response = await client.get(
+            "/api/chat/conversations?limit=0",
+            cookies={"session_token": token},
+        )
+        assert response.status_code == 422
+
 
 # ── Get Conversation tests ───────────────────────────────────────────────────
 
@@ -144,21 +160,14 @@ class TestListConversations:
 class TestGetConversation:
     """Test GET /api/chat/conversations/{id}."""
 
-    def test_get_conversation_with_messages(self, client, test_user, db):
-        """Create conversation + add message via ChatService, GET returns both."""
+    async def test_get_conversation_with_messages(self, client, test_user, db, conv_id):
+        """Add a message via ChatService, GET returns conversation and message."""
         _, token = test_user
-        # Create conversation via API
-        create_resp = client.post(
-            "/api/chat/conversations",
-            cookies={"session_token": token},
-        )
-        conv_id = create_resp.json()["id"]
-
         # Add a message directly via ChatService
         chat_svc = ChatService(db)
         chat_svc.add_message(conv_id, "user", "Hello")
 
-        response = client.get(
+        response = await client.get(
             f"/api/chat/conversations/{conv_id}",
             cookies={"session_token": token},
         )
@@ -171,10 +180,10 @@ class TestGetConversation:
         assert data["messages"][0]["content"] == "Hello"
         assert data["messages"][0]["role"] == "user"
 
-    def test_get_conversation_not_found(self, client, test_user):
+    async def test_get_conversation_not_found(self, client, test_user):
         """GET with nonexistent conversation id returns 404."""
         _, token = test_user
-        response = client.get(
+        response = await client.get(
             "/api/chat/conversations/99999",
             cookies={"session_token": token},
         )
@@ -187,34 +196,27 @@ class TestGetConversation:
 class TestDeleteConversation:
     """Test DELETE /api/chat/conversations/{id}."""
 
-    def test_delete_conversation(self, client, test_user):
-        """Creates, deletes, confirms it's 404 afterwards."""
+    async def test_delete_conversation(self, client, test_user, conv_id):
+        """Deletes, confirms it's 404 afterwards."""
         _, token = test_user
-        # Create
-        create_resp = client.post(
-            "/api/chat/conversations",
-            cookies={"session_token": token},
-        )
-        conv_id = create_resp.json()["id"]
-
         # Delete
-        delete_resp = client.delete(
+        delete_resp = await client.delete(
             f"/api/chat/conversations/{conv_id}",
             cookies={"session_token": token},
         )
         assert delete_resp.status_code == 200
 
         # Confirm 404
-        get_resp = client.get(
+        get_resp = await client.get(
             f"/api/chat/conversations/{conv_id}",
             cookies={"session_token": token},
         )
         assert get_resp.status_code == 404
 
-    def test_delete_conversation_not_found(self, client, test_user):
+    async def test_delete_conversation_not_found(self, client, test_user):
         """DELETE with nonexistent conversation id returns 404."""
         _, token = test_user
-        response = client.delete(
+        response = await client.delete(
             "/api/chat/conversations/99999",
             cookies={"session_token": token},
         )
@@ -227,15 +229,9 @@ class TestDeleteConversation:
 class TestSendMessage:
     """Test POST /api/chat/conversations/{id}/messages."""
 
-    def test_send_message_streams_response(self, client, test_user):
+    async def test_send_message_streams_response(self, client, test_user, conv_id):
         """POST returns streaming response with mocked LLM/Memory/Graph services."""
         _, token = test_user
-        # Create a conversation first
-        create_resp = client.post(
-            "/api/chat/conversations",
-            cookies={"session_token": token},
-        )
-        conv_id = create_resp.json()["id"]
 
         async def fake_stream(messages, model="default", temperature=None):
             yield "Hello "
@@ -247,7 +243,7 @@ class TestSendMessage:
             # Mock MemoryService
             mock_mem = MagicMock()
             mock_mem.search_similar = AsyncMock(return_value=[])
-            mock_mem.embed_message = AsyncMock()
+            mock_mem.embed_messages = AsyncMock()
             mock_mem_factory.return_value = mock_mem
 
             # Mock GraphService
@@ -261,7 +257,7 @@ class TestSendMessage:
             mock_llm.stream_chat = fake_stream
             MockLLM.return_value = mock_llm
 
-            response = client.post(
+            response = await client.post(
                 f"/api/chat/conversations/{conv_id}/messages",
                 json={"content": "Hi there"},
                 cookies={"session_token": token},
@@ -272,23 +268,56 @@ class TestSendMessage:
             assert "Hello " in body
             assert "world" in body
 
-    def test_send_message_to_nonexistent_conversation(self, client, test_user):
+    async def test_send_message_writes_on_writer_thread(self, client, test_user, db, conv_id):
+        """Both messages are saved via the dedicated DB writer thread."""
+        import threading
+
+        _, token = test_user
+
+        original_add = ChatService.add_message
+        writer_threads = []
+
+        def recording_add(self, *args):
+            writer_threads.append(threading.current_thread().name)
+            return original_add(self, *args)
+
+        async def fake_stream(messages, model="default", temperature=None):
+            yield "Saved"
+
+        with patch("backend.routers.chat.LLMService") as MockLLM, \
+             patch("backend.routers.chat._create_memory_service", return_value=None), \
+             patch("backend.routers.chat._create_graph_service", side_effect=ImportError), \
+             patch.object(ChatService, "add_message", recording_add):
+            MockLLM.return_value.stream_chat = fake_stream
+            response = await client.post(
+                f"/api/chat/conversations/{conv_id}/messages",
+                json={"content": "Persist me"},
+                cookies={"session_token": token},
+            )
+            _ = response.text
+
+        assert len(writer_threads) == 2
+        assert all(name.startswith("gantry-db-write") for name in writer_threads)
+        roles = [m.role for m in db.query(Message).filter(Message.conversation_id == conv_id)]
+        assert roles == ["user", "assistant"]
+
+    async def test_send_message_to_nonexistent_conversation(self, client, test_user):
         """POST to nonexistent conversation returns 404."""
         _, token = test_user
 
         with patch("backend.routers.chat.LLMService"), \
              patch("backend.routers.chat._create_memory_service"), \
              patch("backend.routers.chat._create_graph_service"):
-            response = client.post(
+            response = await client.post(
                 "/api/chat/conversations/99999/messages",
                 json={"content": "Hello"},
                 cookies={"session_token": token},
             )
             assert response.status_code == 404
 
-    def test_send_message_unauthenticated(self, client):
+    async def test_send_message_unauthenticated(self, client):
         """POST without cookie returns 401."""
-        response = client.post(
+        response = await client.post(
             "/api/chat/conversations/1/messages",
             json={"content": "Hello"},
         )
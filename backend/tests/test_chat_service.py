@@ -1,16 +1,12 @@
 """Tests for ChatService: CRUD conversations/messages, auto-title, user isolation."""
 import os
 
-# Set test database URL before any backend imports to avoid the module-level
-# create_all in dependencies.py trying to open the default sqlite file.
+# Point the engine dependencies.py builds at import time at an in-memory
+# database instead of the default sqlite file.
 os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
 
 import pytest  # noqa: E402
-from sqlalchemy import create_engine  # noqa: E402
-from sqlalchemy.orm import sessionmaker  # noqa: E402
-from sqlalchemy.pool import StaticPool  # noqa: E402
 
-from backend.database import Base  # noqa: E402
 from backend.models.user import User  # noqa: E402, F401
 from backend.models.session import Session  # noqa: E402, F401
 from backend.models.conversation import Conversation  # noqa: E402, F401
@@ -23,18 +19,9 @@ from backend.services.chat_service import ChatService  # noqa: E402
 
 
 @pytest.fixture(autouse=True)
-def setup_db():
-    """Create an isolated in-memory database for each test."""
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    Base.metadata.create_all(bind=engine)
-    yield TestSessionLocal
-    Base.metadata.drop_all(bind=engine)
-    engine.dispose()
+def setup_db(db_sessionmaker):
+    """Use the shared test database, rolled back after each test."""
+    return db_sessionmaker
 
 
 @pytest.fixture
@@ -167,6 +154,56 @@ class TestGetConversation:
         result = chat.get_conversation(99999, user.id)
         assert result is None
 
+    def test_repeat_lookup_uses_identity_map(self, db, count_statements):
+        """A conversation already loaded in the session is returned without a query."""
+        user = _make_user(db)
+        chat = ChatService(db)
+        conv = chat.create_conversation(user.id)
+        user_id, conv_id = user.id, conv.id
+        chat.get_conversation(conv_id, user_id)
+
+        with count_statements(db.get_bind()) as statements:
+            result = chat.get_conversation(conv_id, user_id)
+
+        assert result.id == conv_id
+        assert statements == []
+
+
+# -- TestGetConversationWithMessages ------------------------------------------
+
+
+class TestGetConversationWithMessages:
+    """Test ChatService.get_conversation_with_messages."""
+
+    def test_loads_messages_in_one_query(self, db, setup_db, count_statements):
+        """Conversation and ordered messages come back from a single SELECT."""
+        user = _make_user(db)
+        chat = ChatService(db)
+        conv = chat.create_conversation(user.id)
+        chat.add_message(conv.id, "user", "first")
+        chat.add_message(conv.id, "assistant", "second")
+        user_id, conv_id = user.id, conv.id
+
+        fresh = setup_db()
+        try:
+            with count_statements(fresh.get_bind()) as statements:
+                result = ChatService(fresh).get_conversation_with_messages(conv_id, user_id)
+                contents = [m.content for m in result.messages]
+        finally:
+            fresh.close()
+
+        assert contents == ["first", "second"]
+        assert len(statements) == 1
+
+    def test_returns_none_for_wrong_user(self, db):
+        """Returns None when a different user asks for the conversation."""
+        user_a = _make_user(db, email="a@example.com")
+        user_b = _make_user(db, email="b@example.com")
+        chat = ChatService(db)
+        conv = chat.create_conversation(user_a.id)
+
+        assert chat.get_conversation_with_messages(conv.id, user_b.id) is None
+
 
 # -- TestDeleteConversation ---------------------------------------------------
 
@@ -184,6 +221,20 @@ class TestDeleteConversation:
         assert result is True
         assert chat.get_conversation(conv.id, user.id) is None
 
+    def test_deletes_messages(self, db):
+        """Removes the conversation's messages but leaves other threads intact."""
+        user = _make_user(db)
+        chat = ChatService(db)
+        conv = chat.create_conversation(user.id)
+        other = chat.create_conversation(user.id)
+        chat.add_message(conv.id, "user", "Hello")
+        chat.add_message(conv.id, "assistant", "Hi there")
+        chat.add_message(other.id, "user", "Keep me")
+
+        assert chat.delete_conversation(conv.id, user.id) is True
+        assert db.query(Message).filter(Message.conversation_id == conv.id).count() == 0
+        assert [m.content for m in chat.get_messages(other.id)] == ["Keep me"]
+
     def test_returns_false_for_wrong_user(self, db):
         """Cannot delete another user's conversation."""
         user_a = _make_user(db, email="a@example.com")
@@ -279,6 +330,17 @@ class TestAddMessage:
 
         assert conv.title == "New Thread"
 
+    def test_message_time_matches_conversation_update(self, db):
+        """The new message and the conversation's updated_at share one timestamp."""
+        user = _make_user(db)
+        chat = ChatService(db)
+        conv = chat.create_conversation(user.id)
+
+        msg = chat.add_message(conv.id, "user", "Hello")
+        db.refresh(conv)
+
+        assert conv.updated_at == msg.created_at
+
 
 # -- TestGetMessages ----------------------------------------------------------
 
@@ -338,3 +400,41 @@ class TestUpdateTitle:
         chat = ChatService(db)
         # Should not raise
         chat.update_title(99999, "Ghost Title")
+
+
+# -- TestRaiseload ------------------------------------------------------------
+
+
+class TestRaiseload:
+    """Test DB_RAISELOAD guarding read-only list queries."""
+
+    def test_lazy_load_raises_when_enabled(self, db, setup_db):
+        """Touching an unloaded relationship on listed rows raises in raiseload mode."""
+        from unittest.mock import patch
+        from sqlalchemy.exc import InvalidRequestError
+        from backend.config import settings
+
+        user = _make_user(db)
+        conv = ChatService(db).create_conversation(user.id)
+        ChatService(db).add_message(conv.id, "user", "Hello")
+
+        fresh = setup_db()
+        try:
+            with patch.object(settings, "db_raiseload", True):
+                conversations = ChatService(fresh).get_conversations(user.id)
+                messages = ChatService(fresh).get_messages(conv.id)
+            with pytest.raises(InvalidRequestError):
+                _ = conversations[0].messages
+            with pytest.raises(InvalidRequestError):
+                _ = messages[0].conversation
+        finally:
+            fresh.close()
+
+    def test_lazy_load_allowed_by_default(self, db):
+        """Without the flag, list queries keep normal lazy loading."""
+        user = _make_user(db)
+        chat = ChatService(db)
+        conv = chat.create_conversation(user.id)
+        chat.add_message(conv.id, "user", "Hello")
+
+        assert chat.get_messages(conv.id)[0].conversation.id == conv.id
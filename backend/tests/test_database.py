@@ -0,0 +1,167 @@
+"""Tests for engine setup in backend.database."""
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.pool import QueuePool  # noqa: E402
+
+from backend.database import get_engine, get_session_maker  # noqa: E402
+
+
+class TestSqlitePragmas:
+    """Test the per-connection SQLite tuning applied by get_engine."""
+
+    def test_file_database_uses_wal(self, tmp_path):
+        """File-backed databases switch to WAL with relaxed fsyncs."""
+        engine = get_engine(f"sqlite:///{tmp_path / 'gantry.db'}")
+        try:
+            with engine.connect() as conn:
+                assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+                # 1 == NORMAL
+                assert conn.execute(text("PRAGMA synchronous")).scalar() == 1
+                assert conn.execute(text("PRAGMA cache_size")).scalar() == -64000
+        finally:
+            engine.dispose()
+
+    def test_memory_database_still_connects(self):
+        """In-memory databases accept the pragmas without error."""
+        engine = get_engine("sqlite:///:memory:")
+        try:
+            with engine.connect() as conn:
+                assert conn.execute(text("SELECT 1")).scalar() == 1
+        finally:
+            engine.dispose()
+
+
+class TestPooling:
+    """Test connection pool selection in get_engine."""
+
+    def test_file_database_reuses_warm_connection(self, tmp_path):
+        """File-backed databases use a LIFO QueuePool."""
+        engine = get_engine(f"sqlite:///{tmp_path / 'gantry.db'}")
+        try:
+            assert isinstance(engine.pool, QueuePool)
+            with engine.connect() as conn:
+                first = conn.connection.dbapi_connection
+            with engine.connect() as conn:
+                assert conn.connection.dbapi_connection is first
+        finally:
+            engine.dispose()
+
+    def test_memory_database_keeps_default_pool(self):
+        """In-memory databases are not switched to a multi-connection pool."""
+        engine = get_engine("sqlite:///:memory:")
+        try:
+            assert not isinstance(engine.pool, QueuePool)
+        finally:
+            engine.dispose()
+
+
+class TestSessionMaker:
+    """Test the session factory used for request-scoped sessions."""
+
+    def test_commit_does_not_expire_instances(self, tmp_path, count_statements):
+        """Rows stay readable after commit without a reload SELECT."""
+        from backend.database import Base
+        from backend.models.user import User
+
+        engine = get_engine(f"sqlite:///{tmp_path / 'gantry.db'}")
+        try:
+            Base.metadata.create_all(bind=engine)
+            db = get_session_maker(engine)()
+            user = User(email="a@example.com", password_hash="x", display_name="A")
+            db.add(user)
+            db.commit()
+
+            with count_statements(engine) as statements:
+                assert user.id is not None
+                assert user.email == "a@example.com"
+                assert user.role == "user"
+            db.close()
+
+            assert statements == []
+        finally:
+            engine.dispose()
+
+
+class TestMigrations:
+    """Test the idempotent schema migrations in backend.dependencies."""
+
+    def _legacy_engine(self, tmp_path):
+        """A database created before pinned/document_scope/persona_id and the history index."""
+        engine = get_engine(f"sqlite:///{tmp_path / 'gantry.db'}")
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE conversations (id INTEGER PRIMARY KEY, user_id INTEGER, "
+                "title VARCHAR, created_at DATETIME, updated_at DATETIME)"
+            ))
+            conn.execute(text(
+                "CREATE TABLE messages (id INTEGER PRIMARY KEY, conversation_id INTEGER, "
+                "role VARCHAR, content TEXT, created_at DATETIME)"
+            ))
+        return engine
+
+    def test_legacy_database_is_upgraded(self, tmp_path):
+        """Missing columns and indexes are added to existing tables."""
+        from sqlalchemy import inspect
+        from backend.dependencies import run_migrations
+
+        engine = self._legacy_engine(tmp_path)
+        try:
+            run_migrations(engine)
+
+            inspector = inspect(engine)
+            columns = {c["name"] for c in inspector.get_columns("conversations")}
+            assert {"pinned", "document_scope", "persona_id"} <= columns
+            indexes = {ix["name"]: ix["column_names"] for ix in inspector.get_indexes("messages")}
+            assert indexes["ix_messages_conversation_created"] == ["conversation_id", "created_at"]
+            indexes = {ix["name"]: ix["column_names"] for ix in inspector.get_indexes("conversations")}
+            assert indexes["ix_conversations_user_pinned_updated"] == ["user_id", "pinned", "updated_at"]
+        finally:
+            engine.dispose()
+
+    def test_current_database_issues_no_ddl(self, tmp_path, count_statements):
+        """A second run finds nothing to do and emits no schema changes."""
+        from backend.dependencies import run_migrations
+
+        engine = self._legacy_engine(tmp_path)
+        try:
+            run_migrations(engine)
+
+            with count_statements(engine) as statements:
+                run_migrations(engine)
+
+            assert not [s for s in statements if s.lstrip().upper().startswith(("ALTER", "CREATE"))]
+        finally:
+            engine.dispose()
+
+
+class TestGetDb:
+    """Test the request-scoped session dependency."""
+
+    async def test_yields_session_and_closes_it(self):
+        """get_db hands out a working session and closes it afterwards."""
+        from unittest.mock import patch
+        from backend import dependencies
+
+        agen = dependencies.get_db()
+        db = await agen.__anext__()
+        assert db.execute(text("SELECT 1")).scalar() == 1
+        with patch.object(db, "close") as mock_close:
+            await agen.aclose()
+        mock_close.assert_called_once()
+
+
+class TestLifespan:
+    """Test schema setup during application startup."""
+
+    def test_startup_initializes_schema(self):
+        """Entering the app lifespan runs init_db."""
+        from unittest.mock import patch
+        from fastapi.testclient import TestClient
+        from backend.main import app
+
+        with patch("backend.main.init_db") as mock_init:
+            with TestClient(app):
+                mock_init.assert_called_once()
@@ -119,6 +119,36 @@ class TestListServices:
         services = svc.list_services()
         assert services == []
 
+    @patch("backend.services.docker_service.docker.from_env")
+    def test_listing_cached_within_ttl(self, mock_from_env):
+        """Repeated polls within the TTL reuse one Docker API listing."""
+        mock_client = MagicMock()
+        mock_from_env.return_value = mock_client
+        mock_client.containers.list.return_value = [_make_container("nebulus-web")]
+
+        svc = DockerService()
+        assert svc.list_services() == svc.list_services()
+        assert mock_client.containers.list.call_count == 1
+
+        with patch("backend.services.docker_service.time.monotonic", return_value=10**9):
+            svc.list_services()
+        assert mock_client.containers.list.call_count == 2
+
+    @patch("backend.services.docker_service.docker.from_env")
+    def test_restart_invalidates_cached_listing(self, mock_from_env):
+        """A restart forces the next poll to fetch fresh container states."""
+        mock_client = MagicMock()
+        mock_from_env.return_value = mock_client
+        container = _make_container("nebulus-web")
+        mock_client.containers.list.return_value = [container]
+
+        svc = DockerService()
+        svc.list_services()
+        assert svc.restart_service("nebulus-web") is True
+        svc.list_services()
+        # list (poll), list (restart lookup), list (poll after invalidation)
+        assert mock_client.containers.list.call_count == 3
+
 
 # ── restart_service ──────────────────────────────────────────────────────────
 
@@ -5,11 +5,7 @@ os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
 
 import pytest  # noqa: E402
 from unittest.mock import MagicMock, patch  # noqa: E402
-from sqlalchemy import create_engine  # noqa: E402
-from sqlalchemy.orm import sessionmaker  # noqa: E402
-from sqlalchemy.pool import StaticPool  # noqa: E402
 
-from backend.database import Base  # noqa: E402
 from backend.models.user import User  # noqa: E402, F401
 from backend.models.session import Session  # noqa: E402, F401
 from backend.models.conversation import Conversation  # noqa: E402, F401
@@ -21,23 +17,15 @@ from backend.services.auth_service import AuthService  # noqa: E402
 from backend.services.document_service import (  # noqa: E402
     DocumentService,
     chunk_text,
+    extract_text_from_pdf,
     extract_text_from_txt,
 )
 
 
 @pytest.fixture(autouse=True)
-def setup_db():
-    """Create an isolated in-memory database for each test."""
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    Base.metadata.create_all(bind=engine)
-    yield TestSessionLocal
-    Base.metadata.drop_all(bind=engine)
-    engine.dispose()
+def setup_db(db_sessionmaker):
+    """Use the shared test database, rolled back after each test."""
+    return db_sessionmaker
 
 
 @pytest.fixture
@@ -60,6 +48,111 @@ def _make_user(db, email: str = "alice@example.com") -> User:
     )
 
 
+# -- Test upload route --------------------------------------------------------
+
+
+@pytest.fixture
+def upload_client():
+    """A TestClient whose upload route uses a mocked DocumentService.
+
+    The mock's upload_document echoes its arguments back as a Document;
+    tests may wrap or replace that side effect. Yields (client, service).
+    """
+    from datetime import datetime
+    from fastapi.testclient import TestClient
+    from backend.main import app
+    from backend.routers.auth import get_current_user
+    from backend.routers.documents import get_document_service
+
+    service = MagicMock()
+    service.upload_document.side_effect = lambda **kwargs: Document(
+        id=1, user_id=kwargs["user_id"], filename=kwargs["filename"],
+        content_type=kwargs["content_type"], file_size=len(kwargs["content"]),
+        status="ready", chunk_count=1, created_at=datetime(2024, 1, 1),
+    )
+    app.dependency_overrides[get_current_user] = lambda: MagicMock(id=1)
+    app.dependency_overrides[get_document_service] = lambda: service
+    try:
+        yield TestClient(app), service
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+        app.dependency_overrides.pop(get_document_service, None)
+
+
+class TestUploadRoute:
+    """Test the document upload endpoint."""
+
+    def test_processing_runs_off_event_loop(self, upload_client):
+        """Document processing runs in a worker thread, not on the event loop."""
+        import asyncio
+
+        client, service = upload_client
+        echo = service.upload_document.side_effect
+        loop_running = []
+
+        def upload(**kwargs):
+            try:
+                asyncio.get_running_loop()
+                loop_running.append(True)
+            except RuntimeError:
+                loop_running.append(False)
+            return echo(**kwargs)
+
+        service.upload_document.side_effect = upload
+        response = client.post(
+            "/api/documents/upload",
+            files={"file": ("notes.txt", b"hello", "text/plain")},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["filename"] == "notes.txt"
+        assert loop_running == [False]
+
+    @pytest.mark.parametrize("filename, mime, expected", [
+        ("report.pdf", "application/pdf", "pdf"),
+        ("notes.TXT", "application/octet-stream", "txt"),
+        ("readme.text", "", "txt"),
+        ("data.csv", "text/csv", "csv"),
+        ("memo.docx", "application/octet-stream", "docx"),
+        ("image.png", "image/png", None),
+    ])
+    def test_document_type_resolution(self, upload_client, filename, mime, expected):
+        """The MIME type wins; otherwise the extension decides or the upload is rejected."""
+        client, service = upload_client
+        response = client.post(
+            "/api/documents/upload",
+            files={"file": (filename, b"hello", mime)},
+        )
+
+        if expected is None:
+            assert response.status_code == 400
+            service.upload_document.assert_not_called()
+        else:
+            assert response.status_code == 200
+            assert service.upload_document.call_args.kwargs["content_type"] == expected
+
+
+# -- Test import cost ---------------------------------------------------------
+
+class TestLazyChromaImport:
+    """chromadb is only loaded once a DocumentService is constructed."""
+
+    def test_app_import_skips_chromadb(self):
+        import subprocess
+        import sys
+
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        result = subprocess.run(
+            [sys.executable, "-c", "import sys, backend.main; print('chromadb' in sys.modules)"],
+            cwd=root,
+            env={**os.environ, "DATABASE_URL": "sqlite:///:memory:"},
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "False"
+
+
 # -- Test chunk_text ----------------------------------------------------------
 
 
@@ -105,6 +198,24 @@ class TestExtractTextFromTxt:
         assert "Caf" in result
 
 
+class TestExtractTextFromPdf:
+    """Test text extraction from PDF files."""
+
+    @patch("pypdf.PdfReader")
+    def test_identical_content_parsed_once(self, mock_reader):
+        """Re-extracting the same bytes is served from the content-hash cache."""
+        page = MagicMock()
+        page.extract_text.return_value = "Page text"
+        mock_reader.return_value.pages = [page, page]
+        content = b"%PDF-1.4 cache-test"
+
+        first = extract_text_from_pdf(content)
+        second = extract_text_from_pdf(content)
+
+        assert first == second == "Page text\n\nPage text"
+        mock_reader.assert_called_once()
+
+
 # -- Test CollectionService ---------------------------------------------------
 
 
@@ -138,6 +249,25 @@ class TestCollectionCRUD:
         collections = service.list_collections(user.id)
         assert len(collections) == 2
 
+    @patch.object(DocumentService, "_get_chroma_collection", return_value=None)
+    def test_list_collections_loads_documents_in_one_query(self, mock_chroma, db, setup_db, count_statements):
+        """Document counts for every listed collection come from a single extra SELECT."""
+        user = _make_user(db)
+        service = DocumentService(db)
+        for name in ("First", "Second", "Third"):
+            collection = service.create_collection(user.id, name)
+            service.upload_document(user.id, f"{name}.txt", b"Content", "txt", collection.id)
+        user_id = user.id
+
+        fresh = setup_db()
+        try:
+            with count_statements(fresh.get_bind()) as statements:
+                collections = DocumentService(fresh).list_collections(user_id)
+                assert [len(c.documents) for c in collections] == [1, 1, 1]
+        finally:
+            fresh.close()
+        assert len(statements) == 2
+
     def test_user_isolation(self, db):
         """Users cannot see other users' collections."""
         user_a = _make_user(db, "a@example.com")
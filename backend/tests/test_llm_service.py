@@ -1,8 +1,8 @@
 """Tests for LLMService: streaming chat, non-streaming chat, error handling."""
 import os
 
-# Set test database URL before any backend imports to avoid the module-level
-# create_all in dependencies.py trying to open the default sqlite file.
+# Point the engine dependencies.py builds at import time at an in-memory
+# database instead of the default sqlite file.
 os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
 
 import json  # noqa: E402
@@ -56,7 +56,7 @@ class TestStreamChat:
 
     @pytest.mark.asyncio
     async def test_stream_chat_yields_content(self):
-        """Mocks httpx.AsyncClient to return SSE lines, verifies chunks."""
+        """Mocks the shared HTTP client to return SSE lines, verifies chunks."""
         # Build SSE lines that the stream would return
         sse_lines = [
             "data: "
@@ -79,10 +79,7 @@ class TestStreamChat:
         mock_client = MagicMock()
         mock_client.stream.return_value = AsyncContextManager(mock_response)
 
-        # Wrap mock_client itself as an async context manager (async with httpx.AsyncClient() as client)
-        mock_client_cm = AsyncContextManager(mock_client)
-
-        with patch("backend.services.llm_service.httpx.AsyncClient", return_value=mock_client_cm):
+        with patch("backend.services.llm_service.get_http_client", return_value=mock_client):
             service = LLMService()
             chunks = []
             async for chunk in service.stream_chat([{"role": "user", "content": "Hi"}]):
@@ -90,16 +87,61 @@ class TestStreamChat:
 
         assert chunks == ["Hello", " world"]
 
+    @pytest.mark.asyncio
+    async def test_stream_chat_skips_malformed_lines(self):
+        """Lines that are not valid JSON are skipped without aborting the stream."""
+        sse_lines = [
+            "data: {not json",
+            "data: " + json.dumps({"choices": [{"delta": {"content": "ok"}}]}),
+            "data: [DONE]",
+        ]
+        mock_response = MagicMock()
+        mock_response.aiter_lines.return_value = AsyncIterator(sse_lines)
+        mock_response.raise_for_status = MagicMock()
+        mock_client = MagicMock()
+        mock_client.stream.return_value = AsyncContextManager(mock_response)
+
+        with patch("backend.services.llm_service.get_http_client", return_value=mock_client):
+            service = LLMService()
+            chunks = [c async for c in service.stream_chat([{"role": "user", "content": "Hi"}])]
+
+        assert chunks == ["ok"]
+
+    @pytest.mark.asyncio
+    async def test_stream_chat_holds_concurrency_slot(self):
+        """A stream occupies an LLM concurrency slot until it finishes."""
+        import asyncio
+        from backend.services import llm_service
+
+        observed = []
+
+        class ObservingIterator(AsyncIterator):
+            async def __anext__(self):
+                observed.append(llm_service._llm_semaphore.locked())
+                return await super().__anext__()
+
+        mock_response = MagicMock()
+        mock_response.aiter_lines.return_value = ObservingIterator(["data: [DONE]"])
+        mock_response.raise_for_status = MagicMock()
+        mock_client = MagicMock()
+        mock_client.stream.return_value = AsyncContextManager(mock_response)
+
+        with patch("backend.services.llm_service.get_http_client", return_value=mock_client), \
+                patch.object(llm_service, "_llm_semaphore", asyncio.Semaphore(1)):
+            service = LLMService()
+            _ = [c async for c in service.stream_chat([{"role": "user", "content": "Hi"}])]
+            assert not llm_service._llm_semaphore.locked()
+
+        assert observed == [True]
+
     @pytest.mark.asyncio
     async def test_stream_chat_connect_error(self):
-        """Mocks httpx.AsyncClient to raise ConnectError, verifies error message chunk."""
+        """Mocks the shared HTTP client to raise ConnectError, verifies error message chunk."""
         # Mock client whose stream() raises ConnectError
         mock_client = MagicMock()
         mock_client.stream.side_effect = httpx.ConnectError("Connection refused")
 
-        mock_client_cm = AsyncContextManager(mock_client)
-
-        with patch("backend.services.llm_service.httpx.AsyncClient", return_value=mock_client_cm):
+        with patch("backend.services.llm_service.get_http_client", return_value=mock_client):
             service = LLMService()
             chunks = []
             async for chunk in service.stream_chat([{"role": "user", "content": "Hi"}]):
@@ -117,7 +159,7 @@ class TestChat:
 
     @pytest.mark.asyncio
     async def test_chat_returns_content(self):
-        """Mocks httpx.AsyncClient.post to return JSON response, verifies content string."""
+        """Mocks the shared client's post to return JSON response, verifies content string."""
         response_data = {
             "choices": [{"message": {"content": "Hello from LLM"}}]
         }
@@ -131,9 +173,7 @@ class TestChat:
         mock_client = MagicMock()
         mock_client.post = AsyncMock(return_value=mock_response)
 
-        mock_client_cm = AsyncContextManager(mock_client)
-
-        with patch("backend.services.llm_service.httpx.AsyncClient", return_value=mock_client_cm):
+        with patch("backend.services.llm_service.get_http_client", return_value=mock_client):
             service = LLMService()
             result = await service.chat([{"role": "user", "content": "Hi"}])
 
@@ -141,15 +181,33 @@ class TestChat:
 
     @pytest.mark.asyncio
     async def test_chat_returns_error_on_failure(self):
-        """Mocks httpx.AsyncClient.post to raise Exception, verifies '[Error:' prefix."""
+        """Mocks the shared client's post to raise Exception, verifies '[Error:' prefix."""
         mock_client = MagicMock()
         mock_client.post = AsyncMock(side_effect=Exception("Something went wrong"))
 
-        mock_client_cm = AsyncContextManager(mock_client)
-
-        with patch("backend.services.llm_service.httpx.AsyncClient", return_value=mock_client_cm):
+        with patch("backend.services.llm_service.get_http_client", return_value=mock_client):
             service = LLMService()
             result = await service.chat([{"role": "user", "content": "Hi"}])
 
         assert result.startswith("[Error:")
         assert "Something went wrong" in result
+
+
+# -- TestSharedHttpClient -----------------------------------------------------
+
+
+class TestSharedHttpClient:
+    """Test the process-wide HTTP client used for TabbyAPI calls."""
+
+    @pytest.mark.asyncio
+    async def test_client_is_reused_until_closed(self):
+        """get_http_client returns one pooled client until it is closed."""
+        from backend.services.http_client import close_http_client, get_http_client
+
+        first = get_http_client()
+        assert get_http_client() is first
+
+        await close_http_client()
+        assert first.is_closed
+        assert get_http_client() is not first
+        await close_http_client()
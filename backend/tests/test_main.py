@@ -0,0 +1,24 @@
+"""Tests for app-level routes defined in backend.main."""
+import os
+
+# Point the engine dependencies.py builds at import time at an in-memory
+# database instead of the default sqlite file.
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from backend.main import app  # noqa: E402
+
+
+# ── Health check tests ───────────────────────────────────────────────────────
+
+
+class TestHealthCheck:
+    """Test the static health endpoint."""
+
+    def test_health_check(self):
+        """/health answers with the static status body."""
+        response = TestClient(app).get("/health")
+        assert response.status_code == 200
+        assert response.json() == {"status": "healthy"}
+        assert response.headers["content-type"] == "application/json"
@@ -36,7 +36,15 @@ if _need_chromadb_mock:
 import importlib  # noqa: E402
 import backend.services.memory_service as _msm  # noqa: E402
 importlib.reload(_msm)
-from backend.services.memory_service import MemoryService  # noqa: E402
+from backend.services.memory_service import MemoryService, reset_connections  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fresh_connections():
+    """Each test connects with its own mocked ChromaDB client."""
+    reset_connections()
+    yield
+    reset_connections()
 
 
 @pytest.fixture
@@ -89,6 +97,91 @@ class TestMemoryServiceInit:
             assert service.collection is None
             assert service.available is False
 
+    @pytest.mark.parametrize("chroma_host, expected", [
+        ("http://chroma:8001", ("chroma", 8001)),
+        ("https://chroma.example.com", ("chroma.example.com", 8000)),
+        ("chroma:9000", ("chroma", 9000)),
+        ("http://[::1]:8001/api", ("::1", 8001)),
+    ])
+    def test_init_parses_chroma_host(self, mock_chroma_client, chroma_host, expected):
+        """CHROMA_HOST accepts bare host:port, full URLs, IPv6 and paths."""
+        with patch("backend.services.memory_service.chromadb") as mock_chromadb, \
+                patch.object(_msm.settings, "chroma_host", chroma_host):
+            mock_chromadb.HttpClient.return_value = mock_chroma_client
+
+            MemoryService(user_id=42)
+
+            host, port = expected
+            mock_chromadb.HttpClient.assert_called_once_with(host=host, port=port)
+
+    def test_reuses_connection_across_instances(self, mock_chroma_client):
+        """A second service for the same user skips the connect round-trips."""
+        with patch("backend.services.memory_service.chromadb") as mock_chromadb:
+            mock_chromadb.HttpClient.return_value = mock_chroma_client
+
+            first = MemoryService(user_id=42)
+            second = MemoryService(user_id=42)
+            MemoryService(user_id=7)
+
+            assert second.collection is first.collection
+            mock_chromadb.HttpClient.assert_called_once()
+            assert mock_chroma_client.get_or_create_collection.call_count == 2
+
+    def test_slow_connect_does_not_block_cached_users(self, mock_chroma_client):
+        """Resolving one user's collection does not hold the shared lock."""
+        import threading
+
+        connecting = threading.Event()
+        release = threading.Event()
+        fast_collection = mock_chroma_client.get_or_create_collection.return_value
+
+        def get_or_create_collection(name):
+            if name == "user_7_messages":
+                connecting.set()
+                release.wait(timeout=5)
+            return fast_collection
+
+        with patch("backend.services.memory_service.chromadb") as mock_chromadb:
+            mock_chromadb.HttpClient.return_value = mock_chroma_client
+            MemoryService(user_id=42)
+            mock_chroma_client.get_or_create_collection.side_effect = get_or_create_collection
+
+            slow = threading.Thread(target=MemoryService, args=(7,))
+            slow.start()
+            try:
+                assert connecting.wait(timeout=5)
+                finished = threading.Event()
+                threading.Thread(target=lambda: (MemoryService(user_id=42), finished.set())).start()
+                assert finished.wait(timeout=2)
+            finally:
+                release.set()
+                slow.join(timeout=5)
+
+    def test_collection_handles_are_bounded(self, mock_chroma_client):
+        """Least recently used handles are evicted past the size limit."""
+        with patch("backend.services.memory_service.chromadb") as mock_chromadb, \
+                patch.object(_msm, "COLLECTION_HANDLES_MAX_SIZE", 2):
+            mock_chromadb.HttpClient.return_value = mock_chroma_client
+
+            MemoryService(user_id=1)
+            MemoryService(user_id=2)
+            MemoryService(user_id=1)
+            MemoryService(user_id=3)
+
+            assert [key[2] for key in _msm._collections] == [1, 3]
+
+    def test_failed_operation_drops_collection(self, mock_chroma_client, mock_chroma_collection):
+        """After a failed query the next service resolves the collection again."""
+        mock_chroma_collection.query.side_effect = Exception("Collection does not exist")
+
+        with patch("backend.services.memory_service.chromadb") as mock_chromadb:
+            mock_chromadb.HttpClient.return_value = mock_chroma_client
+
+            _run(MemoryService(user_id=42).search_similar("hello"))
+            MemoryService(user_id=42)
+
+            assert mock_chroma_client.get_or_create_collection.call_count == 2
+
 
 class TestEmbedMessage:
     """Tests for the embed_message method."""
@@ -150,6 +243,28 @@ class TestEmbedMessage:
             assert result is None
 
 
+class TestEmbedMessages:
+    """Tests for the embed_messages batch method."""
+
+    def test_embed_messages_uses_single_add(self, mock_chroma_client, mock_chroma_collection):
+        """Test that a batch is stored with one ChromaDB add call."""
+        with patch("backend.services.memory_service.chromadb") as mock_chromadb:
+            mock_chromadb.HttpClient.return_value = mock_chroma_client
+
+            service = MemoryService(user_id=42)
+            result = _run(service.embed_messages([
+                (1, "Question?", {"role": "user"}),
+                (2, "Answer.", None),
+            ]))
+
+            assert result is True
+            mock_chroma_collection.add.assert_called_once_with(
+                ids=["msg_1", "msg_2"],
+                documents=["Question?", "Answer."],
+                metadatas=[{"role": "user"}, {}]
+            )
+
+
 class TestSearchSimilar:
     """Tests for the search_similar method."""
 
@@ -199,6 +314,28 @@ class TestSearchSimilar:
                 n_results=5
             )
 
+    def test_search_similar_queries_off_event_loop(self, mock_chroma_client, mock_chroma_collection):
+        """The blocking ChromaDB query runs in a worker thread."""
+        loop_running = []
+        results = mock_chroma_collection.query.return_value
+
+        def query(**kwargs):
+            try:
+                asyncio.get_running_loop()
+                loop_running.append(True)
+            except RuntimeError:
+                loop_running.append(False)
+            return results
+
+        mock_chroma_collection.query.side_effect = query
+        with patch("backend.services.memory_service.chromadb") as mock_chromadb:
+            mock_chromadb.HttpClient.return_value = mock_chroma_client
+
+            service = MemoryService(user_id=42)
+            _run(service.search_similar("Hello"))
+
+        assert loop_running == [False]
+
     def test_search_similar_when_unavailable(self):
         """Test search_similar returns empty list when ChromaDB unavailable."""
         with patch("backend.services.memory_service.chromadb") as mock_chromadb:
@@ -239,6 +376,88 @@ class TestSearchSimilar:
             assert results == []
 
 
+class TestSearchCache:
+    """Tests for the short-lived search result cache."""
+
+    def test_repeated_query_is_served_from_cache(self, mock_chroma_client, mock_chroma_collection):
+        """The same query (modulo whitespace) hits ChromaDB once."""
+        with patch("backend.services.memory_service.chromadb") as mock_chromadb:
+            mock_chromadb.HttpClient.return_value = mock_chroma_client
+
+            service = MemoryService(user_id=42)
+            first = _run(service.search_similar("Hello there", limit=3))
+            second = _run(service.search_similar("  Hello   there ", limit=3))
+
+            assert first == second
+            mock_chroma_collection.query.assert_called_once()
+
+    def test_cache_is_per_user_and_limit(self, mock_chroma_client, mock_chroma_collection):
+        """Different users or limits do not share results."""
+        with patch("backend.services.memory_service.chromadb") as mock_chromadb:
+            mock_chromadb.HttpClient.return_value = mock_chroma_client
+
+            _run(MemoryService(user_id=42).search_similar("Hello", limit=3))
+            _run(MemoryService(user_id=42).search_similar("Hello", limit=5))
+            _run(MemoryService(user_id=7).search_similar("Hello", limit=3))
+
+            assert mock_chroma_collection.query.call_count == 3
+
+    def test_embedding_evicts_user_results(self, mock_chroma_client, mock_chroma_collection):
+        """New messages for a user make the next search go to ChromaDB."""
+        with patch("backend.services.memory_service.chromadb") as mock_chromadb:
+            mock_chromadb.HttpClient.return_value = mock_chroma_client
+
+            service = MemoryService(user_id=42)
+            _run(service.search_similar("Hello"))
+            _run(service.embed_message(message_id=9, content="Hello again"))
+            _run(service.search_similar("Hello"))
+
+            assert mock_chroma_collection.query.call_count == 2
+
+    def test_embed_during_pending_query_is_not_overwritten(self, mock_chroma_client, mock_chroma_collection):
+        """Results of a query that overlapped an embed are not cached."""
+        import threading
+
+        query_started = threading.Event()
+        release_query = threading.Event()
+        results = mock_chroma_collection.query.return_value
+
+        def slow_query(**kwargs):
+            query_started.set()
+            release_query.wait(timeout=5)
+            return results
+
+        mock_chroma_collection.query.side_effect = slow_query
+
+        async def interleave(service):
+            search = asyncio.ensure_future(service.search_similar("Hello"))
+            await asyncio.to_thread(query_started.wait, 5)
+            await service.embed_message(message_id=9, content="Hello again")
+            release_query.set()
+            await search
+
+        with patch("backend.services.memory_service.chromadb") as mock_chromadb:
+            mock_chromadb.HttpClient.return_value = mock_chroma_client
+
+            service = MemoryService(user_id=42)
+            _run(interleave(service))
+            _run(service.search_similar("Hello"))
+
+            assert mock_chroma_collection.query.call_count == 2
+
+    def test_failures_are_not_cached(self, mock_chroma_client, mock_chroma_collection):
+        """A failed query is retried on the next search."""
+        mock_chroma_collection.query.side_effect = [
+            Exception("Query error"),
+            mock_chroma_collection.query.return_value,
+        ]
+        with patch("backend.services.memory_service.chromadb") as mock_chromadb:
+            mock_chromadb.HttpClient.return_value = mock_chroma_client
+
+            assert _run(MemoryService(user_id=42).search_similar("Hello")) == []
+            assert len(_run(MemoryService(user_id=42).search_similar("Hello"))) == 2
+
+
 class TestMemoryServiceAvailability:
     """Tests for the availability property."""
 
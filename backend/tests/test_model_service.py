@@ -1,12 +1,20 @@
-"""Tests for ModelService with mocked httpx client."""
+"""Tests for ModelService with a mocked shared httpx client."""
 
 import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
-import pytest  # noqa: F401
+import pytest
 
-from backend.services.model_service import ModelService
+from backend.services.model_service import ModelService, invalidate_models_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_models_cache():
+    """Each test starts without a cached model list."""
+    invalidate_models_cache()
+    yield
+    invalidate_models_cache()
 
 
 def _run(coro):
@@ -32,7 +40,7 @@ def _make_mock_response(status_code=200, json_data=None, raise_for_status=None):
 
 def _patch_async_client(get_responses=None, post_response=None, get_side_effect=None,
                         post_side_effect=None):
-    """Create a context manager that patches httpx.AsyncClient with given responses.
+    """Create a context manager that patches the shared HTTP client with given responses.
 
     get_responses: list of responses for successive GET calls.
     post_response: single response for POST calls.
@@ -51,21 +59,19 @@ def _patch_async_client(get_responses=None, post_response=None, get_side_effect=
     elif post_response:
         mock_client.post = AsyncMock(return_value=post_response)
 
-    patcher = patch("backend.services.model_service.httpx.AsyncClient")
+    patcher = patch("backend.services.model_service.get_http_client", return_value=mock_client)
     return patcher, mock_client
 
 
 class _AsyncClientPatch:
-    """Context manager for patching httpx.AsyncClient."""
+    """Context manager for patching the shared httpx client."""
 
     def __init__(self, mock_client):
         self._mock_client = mock_client
-        self._patcher = patch("backend.services.model_service.httpx.AsyncClient")
+        self._patcher = patch("backend.services.model_service.get_http_client", return_value=mock_client)
 
     def __enter__(self):
-        mock_cls = self._patcher.start()
-        mock_cls.return_value.__aenter__ = AsyncMock(return_value=self._mock_client)
-        mock_cls.return_value.__aexit__ = AsyncMock(return_value=False)
+        self._patcher.start()
         return self._mock_client
 
     def __exit__(self, *args):
@@ -113,6 +119,32 @@ class TestGetActiveModel:
 
         assert result is None
 
+    def test_caches_active_model(self):
+        """A second lookup within the TTL does not hit TabbyAPI."""
+        mock_client = AsyncMock()
+        mock_client.get = AsyncMock(return_value=_make_mock_response(json_data={"id": "llama-3-8b"}))
+
+        with _AsyncClientPatch(mock_client):
+            svc = ModelService()
+            first = _run(svc.get_active_model())
+            second = _run(svc.get_active_model())
+
+        assert first == second == {"id": "llama-3-8b", "name": "llama-3-8b"}
+        assert mock_client.get.call_count == 1
+
+    def test_does_not_cache_failures(self):
+        """An unreachable TabbyAPI is retried on the next lookup."""
+        mock_client = AsyncMock()
+        mock_client.get = AsyncMock(side_effect=[
+            httpx.ConnectError("Connection refused"),
+            _make_mock_response(json_data={"id": "llama-3-8b"}),
+        ])
+
+        with _AsyncClientPatch(mock_client):
+            svc = ModelService()
+            assert _run(svc.get_active_model()) is None
+            assert _run(svc.get_active_model()) == {"id": "llama-3-8b", "name": "llama-3-8b"}
+
 
 # ── list_models ─────────────────────────────────────────────────────────────
 
@@ -120,9 +152,9 @@ class TestGetActiveModel:
 class TestListModels:
     """Test ModelService.list_models with mocked HTTP responses.
 
-    Note: list_models() internally calls get_active_model() first (GET /v1/model),
-    then fetches the model list (GET /v1/models). Both use separate httpx clients,
-    so we need to mock both GET calls.
+    Note: list_models() starts get_active_model() (GET /v1/model) and then the
+    model list fetch (GET /v1/models) concurrently on the shared client, so we
+    need to mock both GET calls, in that order.
     """
 
     def test_returns_parsed_models_with_active_flag(self):
@@ -145,6 +177,63 @@ class TestListModels:
         assert models[0] == {"id": "llama-3-8b", "name": "llama-3-8b", "active": True}
         assert models[1] == {"id": "mistral-7b", "name": "mistral-7b", "active": False}
 
+    def test_fetches_active_model_and_list_concurrently(self):
+        """Both TabbyAPI requests are in flight at the same time."""
+        both_started = asyncio.Event()
+        in_flight = []
+
+        async def get(url, **kwargs):
+            in_flight.append(url)
+            if len(in_flight) == 2:
+                both_started.set()
+            await asyncio.wait_for(both_started.wait(), timeout=1.0)
+            if url.endswith("/v1/models"):
+                return _make_mock_response(json_data={"data": [{"id": "llama-3-8b"}]})
+            return _make_mock_response(json_data={"id": "llama-3-8b"})
+
+        mock_client = AsyncMock()
+        mock_client.get = get
+
+        with _AsyncClientPatch(mock_client):
+            svc = ModelService()
+            models = _run(svc.list_models())
+
+        assert models == [{"id": "llama-3-8b", "name": "llama-3-8b", "active": True}]
+
+    def test_caches_model_list(self):
+        """A second call within the TTL is served without hitting TabbyAPI."""
+        active_resp = _make_mock_response(json_data={"id": "llama-3-8b"})
+        list_resp = _make_mock_response(json_data={"data": [{"id": "llama-3-8b"}]})
+        mock_client = AsyncMock()
+        mock_client.get = AsyncMock(side_effect=[active_resp, list_resp])
+
+        with _AsyncClientPatch(mock_client):
+            svc = ModelService()
+            first = _run(svc.list_models())
+            second = _run(svc.list_models())
+
+        assert first == second == [{"id": "llama-3-8b", "name": "llama-3-8b", "active": True}]
+        assert mock_client.get.call_count == 2
+
+    def test_switch_invalidates_cached_list(self):
+        """Switching models forces the next list_models to refetch."""
+        mock_client = AsyncMock()
+        mock_client.get = AsyncMock(side_effect=[
+            _make_mock_response(json_data={"id": "llama-3-8b"}),
+            _make_mock_response(json_data={"data": [{"id": "llama-3-8b"}, {"id": "mistral-7b"}]}),
+            _make_mock_response(json_data={"id": "mistral-7b"}),
+            _make_mock_response(json_data={"data": [{"id": "llama-3-8b"}, {"id": "mistral-7b"}]}),
+        ])
+        mock_client.post = AsyncMock(return_value=_make_mock_response())
+
+        with _AsyncClientPatch(mock_client):
+            svc = ModelService()
+            _run(svc.list_models())
+            assert _run(svc.switch_model("mistral-7b")) is True
+            models = _run(svc.list_models())
+
+        assert [m["id"] for m in models if m["active"]] == ["mistral-7b"]
+
     def test_returns_empty_on_connection_error(self):
         """list_models should return [] when TabbyAPI is unreachable."""
         mock_client = AsyncMock()
@@ -222,6 +311,7 @@ class TestSwitchModel:
         mock_client.post.assert_called_once_with(
             f"{svc.base_url}/v1/model/load",
             json={"model_name": "llama-3-8b"},
+            timeout=30.0,
         )
 
     def test_switch_returns_false_on_connection_error(self):
@@ -283,6 +373,7 @@ class TestUnloadModel:
         assert result is True
         mock_client.post.assert_called_once_with(
             f"{svc.base_url}/v1/model/unload",
+            timeout=30.0,
         )
 
     def test_unload_returns_false_on_error(self):
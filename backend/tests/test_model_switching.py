@@ -7,12 +7,7 @@ os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
 
 import pytest  # noqa: E402
 from fastapi.testclient import TestClient  # noqa: E402
-from sqlalchemy import create_engine  # noqa: E402
-from sqlalchemy.orm import sessionmaker  # noqa: E402
-from sqlalchemy.pool import StaticPool  # noqa: E402
 
-from backend.database import Base  # noqa: E402
-from backend.dependencies import get_db  # noqa: E402
 from backend.main import app  # noqa: E402
 from backend.models.user import User  # noqa: E402, F401
 from backend.models.session import Session  # noqa: E402, F401
@@ -23,35 +18,13 @@ from backend.services.auth_service import AuthService  # noqa: E402
 # ── Test database setup ──────────────────────────────────────────────────────
 
 
-@pytest.fixture(autouse=True)
-def setup_db():
-    """Create an isolated in-memory database for each test."""
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    Base.metadata.create_all(bind=engine)
-
-    def override_get_db():
-        db = TestSessionLocal()
-        try:
-            yield db
-        finally:
-            db.close()
-
-    app.dependency_overrides[get_db] = override_get_db
-    yield TestSessionLocal
-    app.dependency_overrides.pop(get_db, None)
-    Base.metadata.drop_all(bind=engine)
-    engine.dispose()
+pytestmark = pytest.mark.usefixtures("app_db")
 
 
 @pytest.fixture
-def db(setup_db):
+def db(app_db):
     """Provide a test database session."""
-    session = setup_db()
+    session = app_db()
     try:
         yield session
     finally:
@@ -166,8 +139,9 @@ class TestModelSwitching:
                 cookies={"session_token": token},
             )
 
-            # Should NOT switch
+            # Should NOT switch, and the initial lookup is reused
             assert not mock_switch.called
+            assert mock_get_active.call_count == 1
             assert response.status_code == 200
 
     def test_switch_fails_returns_error(self, client, test_user, db):
@@ -4,11 +4,7 @@ import os
 os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
 
 import pytest  # noqa: E402
-from sqlalchemy import create_engine  # noqa: E402
-from sqlalchemy.orm import sessionmaker  # noqa: E402
-from sqlalchemy.pool import StaticPool  # noqa: E402
 
-from backend.database import Base  # noqa: E402
 from backend.models.user import User  # noqa: E402, F401
 from backend.models.session import Session  # noqa: E402, F401
 from backend.models.conversation import Conversation  # noqa: E402, F401
@@ -22,18 +18,9 @@ from backend.services.chat_service import ChatService  # noqa: E402
 
 
 @pytest.fixture(autouse=True)
-def setup_db():
-    """Create an isolated in-memory database for each test."""
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    Base.metadata.create_all(bind=engine)
-    yield TestSessionLocal
-    Base.metadata.drop_all(bind=engine)
-    engine.dispose()
+def setup_db(db_sessionmaker):
+    """Use the shared test database, rolled back after each test."""
+    return db_sessionmaker
 
 
 @pytest.fixture